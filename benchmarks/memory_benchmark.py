@@ -0,0 +1,81 @@
+"""Measure memory used per live bottle, popup and effect
+
+Run from the repository root:
+    python benchmarks/memory_benchmark.py [--count N]
+"""
+import argparse, gc, os, sys, tempfile, tracemalloc
+
+# Run without a window, and keep the game's log and save files out of the working directory
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.chdir(tempfile.mkdtemp(prefix='bottle_ops_bench_'))
+
+import pygame as pg
+import main
+
+
+def owned_surface_bytes(objects):
+    """Pixel bytes of Surfaces referenced directly by the objects, counting each Surface once"""
+    seen = set()
+    total = 0
+    for obj in objects:
+        names = set(getattr(obj, '__dict__', {}))
+        for cls in type(obj).__mro__:
+            names.update(getattr(cls, '__slots__', ()))
+        for name in names:
+            value = getattr(obj, name, None)
+            if isinstance(value, pg.Surface) and id(value) not in seen:
+                seen.add(id(value))
+                total += value.get_width() * value.get_height() * value.get_bytesize()
+    return total
+
+
+def measure(make_objects, count):
+    """Return (heap bytes, Surface pixel bytes) per object for the list of count objects make_objects builds"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = make_objects(count)
+    heap = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return heap / count, owned_surface_bytes(objects) / count
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000, help="objects to create per measurement")
+    args = parser.parse_args()
+
+    main.seed_game(0)
+    type_ids = list(main.bottle_config.bottle_types)
+    font = main.font_small
+    sequence = main.FrameSequence([pg.Surface((8, 8))], fps=8)
+
+    def bottle_args(i):
+        return (100, 100, 400, 500, type_ids[i % len(type_ids)], "right" if i % 2 else "left")
+
+    def make_engine_bottles(count):
+        # Includes the engine's arrays, sized for exactly count bottles
+        engine = main.BottleEngine(capacity=count)
+        return [main.EngineBottle(engine, *bottle_args(i)) for i in range(count)]
+
+    cases = [
+        ('Bottle', lambda count: [main.Bottle(*bottle_args(i)) for i in range(count)]),
+        ('ScorePopup', lambda count: [main.ScorePopup(100, 100, "+10", main.WHITE, font) for _ in range(count)]),
+        ('VisualEffect', lambda count: [main.VisualEffect(100, 100, 'shatter', main.image_manager) for _ in range(count)]),
+        ('AnimationCursor', lambda count: [main.AnimationCursor(sequence) for _ in range(count)]),
+    ]
+    if main.np is not None:
+        cases.insert(1, ('EngineBottle', make_engine_bottles))
+
+    print(f"{'object':<16}{'heap B/obj':>12}{'surface B/obj':>15}{'total B/obj':>13}")
+    for name, make_objects in cases:
+        heap, surfaces = measure(make_objects, args.count)
+        print(f"{name:<16}{heap:>12.0f}{surfaces:>15.0f}{heap + surfaces:>13.0f}")
+    pg.quit()
+
+
+if __name__ == '__main__':
+    main_benchmark()
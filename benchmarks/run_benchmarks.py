@@ -0,0 +1,292 @@
+"""Time the game's hot paths and compare them against a saved baseline
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py --save-baseline    # record benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py                    # compare, exits 1 on a regression
+
+Baselines are machine specific, record one on the machine that runs the comparison.
+"""
+import argparse, json, logging, os, platform, random, shutil, statistics, sys, tempfile, time
+
+# Run without a window, and keep the game's log and save files out of the working directory
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+WORK_DIR = tempfile.mkdtemp(prefix='bottle_ops_bench_')
+os.chdir(WORK_DIR)
+
+import pygame as pg
+import main
+
+# The game logs every dodge and load, only warnings are worth seeing next to the results
+logging.getLogger().setLevel(logging.WARNING)
+
+DEFAULT_BASELINE = os.path.join(REPO_DIR, 'benchmarks', 'baseline.json')
+BOTTLE_COUNTS = (10, 100, 1000)
+BOTTLE_FRAMES = 30  # Frames timed per repeat, bottles are staggered so they cover every depth
+RESOLUTIONS = ((800, 600), (1280, 720), (1920, 1080), (2560, 1440))
+LEADERBOARD_SIZES = (10_000, 100_000, 1_000_000)
+HEADLESS_STEPS = 600
+# Timings this close to the baseline are never regressions, sub-millisecond cases are mostly noise
+MIN_REGRESSION_MS = 0.05
+
+
+def time_calls(func, repeats, warmup=1):
+    """Call func warmup + repeats times and return the timed calls in milliseconds"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - begin) * 1000)
+    return timings
+
+
+def wait_for_images(manager, timeout=60):
+    """Wait for an ImageManager to finish loading"""
+    deadline = time.perf_counter() + timeout
+    while manager.is_loading() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+
+
+def wait_for_refit(timeout=30):
+    """Wait for the background refit after a resize, so every resolution draws its own fitted images"""
+    manager = main.image_manager
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        pending = [key for key, image in list(manager.images.items())
+                   if image and key.startswith(main.DOWNSCALE_IMAGE_PREFIXES) and key in manager.native_sizes
+                   and image.get_size() != manager.get_display_size(key, manager.native_sizes[key])]
+        if not pending:
+            return
+        time.sleep(0.01)
+
+
+def make_bottles(count, engine=None):
+    """count bottles thrown at the player with the game's loaded images, plain bottles are each advanced a different number of frames"""
+    main.seed_game(0)
+    type_ids = list(main.bottle_config.bottle_types)
+    start_x, start_y = main.drunk_x + main.drunk_width // 2, main.drunk_y + main.drunk_height // 2
+    bottles = []
+    for i in range(count):
+        target_x = main.SCREEN_WIDTH * (i % 17 + 1) // 18
+        args = (start_x, start_y, target_x, main.player_base_y, type_ids[i % len(type_ids)], "right" if i % 2 else "left")
+        bottle = main.EngineBottle(engine, *args) if engine else main.Bottle(*args)
+        # The game always draws through the loaded images and their sprite cache, spawn_bottle() sets this too
+        bottle.image_manager = main.image_manager
+        bottles.append(bottle)
+    if engine:
+        return bottles
+    for i, bottle in enumerate(bottles):
+        for _ in range(i % BOTTLE_FRAMES):
+            bottle.update()
+    return bottles
+
+
+def bench_bottles(repeats):
+    """Bottle.update and Bottle.draw per frame, plus the vectorized engine update when numpy is installed"""
+    results = {}
+    for count in BOTTLE_COUNTS:
+        update_ms, draw_ms, engine_ms = [], [], []
+        for _ in range(repeats):
+            bottles = make_bottles(count)
+            for _ in range(BOTTLE_FRAMES):
+                begin = time.perf_counter()
+                for bottle in bottles:
+                    bottle.update()
+                middle = time.perf_counter()
+                for bottle in bottles:
+                    bottle.draw(main.screen)
+                update_ms.append((middle - begin) * 1000)
+                draw_ms.append((time.perf_counter() - middle) * 1000)
+
+            if main.np is not None:
+                engine = main.BottleEngine(capacity=count)
+                make_bottles(count, engine)
+                engine_ms.extend(time_calls(engine.update_all, BOTTLE_FRAMES, warmup=0))
+
+        results[f'bottle_update_{count}'] = update_ms
+        results[f'bottle_draw_{count}'] = draw_ms
+        if engine_ms:
+            results[f'bottle_engine_update_{count}'] = engine_ms
+    return results
+
+
+def bench_image_manager(repeats):
+    """Full ImageManager load into an empty asset cache (cold) and from a populated one (warm)"""
+    cold_dir = tempfile.mkdtemp(dir=WORK_DIR)
+    warm_dir = tempfile.mkdtemp(dir=WORK_DIR)
+
+    # Seed the warm cache with the bundled copy of every URL, so images load through AssetCache without the network
+    os.chdir(warm_dir)
+    cache = main.AssetCache()
+    urls = [url for key, url in main.IMAGE_URLS.items() if key != 'bottles' and isinstance(url, str)]
+    urls += [url for key, value in main.IMAGE_URLS.items() if key != 'bottles' and isinstance(value, list) for url in value]
+    urls += list(main.IMAGE_URLS['bottles'].values())
+    for url in set(filter(None, urls)):
+        path = main.image_manager.get_bundled_image_path(url)
+        if path:
+            with open(path, 'rb') as f:
+                cache.put(url, f.read())
+    cache.save_index()
+
+    def load(directory, prefer_bundled):
+        main.PREFER_BUNDLED_IMAGES = prefer_bundled
+        os.chdir(directory)
+        shutil.rmtree(os.path.join(cold_dir, main.ASSET_CACHE_DIR), ignore_errors=True)
+        wait_for_images(main.ImageManager())
+
+    try:
+        return {
+            'image_manager_cold': time_calls(lambda: load(cold_dir, True), repeats, warmup=0),
+            'image_manager_warm': time_calls(lambda: load(warm_dir, False), repeats),
+        }
+    finally:
+        main.PREFER_BUNDLED_IMAGES = True
+        os.chdir(WORK_DIR)
+
+
+def bench_backgrounds(repeats):
+    """draw_background for the game and menu screens at several resolutions"""
+    results = {}
+    original_size = (main.SCREEN_WIDTH, main.SCREEN_HEIGHT)
+    try:
+        for width, height in RESOLUTIONS:
+            main.update_screen_dimensions(width, height)
+            wait_for_refit()
+            surface = pg.Surface((width, height)).convert()
+            for bg_type in ('game', 'menu'):
+                results[f'draw_background_{bg_type}_{width}x{height}'] = time_calls(
+                    lambda: main.draw_background(surface, bg_type), repeats * 10)
+    finally:
+        main.update_screen_dimensions(*original_size)
+        wait_for_refit()
+    return results
+
+
+def make_leaderboard(size):
+    """A leaderboard saved in the work directory, pre-filled with size random scores"""
+    rng = random.Random(size)
+    leaderboard = main.LeaderboardManager(os.path.join(WORK_DIR, f"leaderboard_{size}.json"))
+    leaderboard.scores = sorted(({'username': f"player{i}", 'score': rng.randrange(1_000_000)} for i in range(size)),
+                                key=lambda x: x['score'], reverse=True)
+    return leaderboard
+
+
+def bench_leaderboard(repeats):
+    """LeaderboardManager.add_score, which sorts and saves the whole table, and show_leaderboard"""
+    results = {}
+    rng = random.Random(0)
+    for size in LEADERBOARD_SIZES:
+        leaderboard = make_leaderboard(size)
+        # A million entries takes seconds per call, fewer repeats keep the suite usable
+        runs = repeats if size < 1_000_000 else max(1, repeats // 2)
+        results[f'leaderboard_add_score_{size}'] = time_calls(
+            lambda: leaderboard.add_score("BENCH", rng.randrange(1_000_000)), runs, warmup=0)
+
+    main.leaderboard = make_leaderboard(LEADERBOARD_SIZES[0])
+    main.leaderboard_scroll = 0
+    results['show_leaderboard'] = time_calls(main.show_leaderboard, repeats * 10)
+    return results
+
+
+def bench_headless(repeats):
+    """A rendered dodge bot session and a replay of it, per simulation step"""
+    replay_file = os.path.join(WORK_DIR, "bench.replay")
+    session_ms, replay_ms = [], []
+    for _ in range(repeats):
+        results = main.run_headless(main.HEADLESS_BOTS['dodge'], HEADLESS_STEPS, True, 0, replay_file)
+        session_ms.append(results['seconds'] * 1000 / HEADLESS_STEPS)
+        results = main.play_replay(replay_file)
+        replay_ms.append(results['seconds'] * 1000 / HEADLESS_STEPS)
+    return {'headless_dodge_step': session_ms, 'replay_step': replay_ms}
+
+
+BENCHMARKS = {
+    'bottles': bench_bottles,
+    'images': bench_image_manager,
+    'backgrounds': bench_backgrounds,
+    'leaderboard': bench_leaderboard,
+    'headless': bench_headless,
+}
+
+
+def summarize(timings):
+    """Median, minimum and p95 of a list of millisecond timings"""
+    ordered = sorted(timings)
+    return {
+        'median_ms': round(statistics.median(ordered), 4),
+        'min_ms': round(ordered[0], 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        'runs': len(ordered)
+    }
+
+
+def find_regressions(results, baseline, threshold):
+    """Cases whose median is more than threshold slower than the baseline, as (name, baseline ms, current ms)"""
+    regressions = []
+    for name, summary in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = max(previous['median_ms'] * (1 + threshold), previous['median_ms'] + MIN_REGRESSION_MS)
+        if summary['median_ms'] > limit:
+            regressions.append((name, previous['median_ms'], summary['median_ms']))
+    return regressions
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="timed repeats per case")
+    parser.add_argument('--only', choices=sorted(BENCHMARKS), action='append', help="run only these groups")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown before a case fails, 0.2 is 20%%")
+    parser.add_argument('--output', metavar='FILE', help="also write the results to FILE")
+    args = parser.parse_args()
+
+    main.prepare_headless_run()
+
+    results = {}
+    for group in args.only or BENCHMARKS:
+        begin = time.perf_counter()
+        for name, timings in BENCHMARKS[group](args.repeat).items():
+            results[name] = summarize(timings)
+        print(f"{group} done in {time.perf_counter() - begin:.1f}s", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pg.version.ver,
+        'numpy': main.np.__version__ if main.np is not None else None,
+        'machine': platform.platform(),
+        'results': results
+    }
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print(f"{'case':<36}{'median ms':>12}{'p95 ms':>12}{'baseline':>12}{'change':>9}")
+    for name, summary in results.items():
+        previous = baseline.get(name)
+        change = f"{summary['median_ms'] / previous['median_ms'] - 1:+.0%}" if previous and previous['median_ms'] else ""
+        previous_ms = f"{previous['median_ms']:.3f}" if previous else "-"
+        print(f"{name:<36}{summary['median_ms']:>12.3f}{summary['p95_ms']:>12.3f}{previous_ms:>12}{change:>9}")
+
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {path}")
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for name, previous_ms, current_ms in regressions:
+        print(f"REGRESSION {name}: {previous_ms:.3f} ms -> {current_ms:.3f} ms")
+    pg.quit()
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_benchmark())
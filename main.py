@@ -1,10 +1,93 @@
+import os
+# Keep pygame's support banner off stdout, headless runs print their results there as JSON
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 import pygame as pg
-from sys import exit
+from sys import exit, argv
 from io import BytesIO
-import logging, json, os, math, threading, time, urllib.request, random
+import logging, json, math, threading, time, urllib.request, urllib.parse, random, hashlib, struct, zlib, queue, atexit, csv
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+
+# NumPy is optional, it is only needed for the vectorized bottle engine
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Logging goes through a queue, the file and terminal are written by a background thread so they never stall a frame
+LOG_FILE = 'bottle_ops.log'
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the log file at this size
+LOG_BACKUP_COUNT = 3  # Rotated log files kept
+
+# Hot path loggers and the most records per second each may write, the rest are counted and reported
+LOG_RATE_LIMITS = {
+    'gameplay.dodge': 2,
+    'gameplay.hit': 5,
+}
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread instead of the caller"""
+    
+    def prepare(self, record):
+        # Tracebacks are rendered now, the frames they reference won't live until the listener gets to them
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class LogRateLimiter(logging.Filter):
+    """Drops records past a per second limit for each rate limited logger, noting the count on the next one let through"""
+    
+    def __init__(self, limits):
+        super().__init__()
+        self.limits = limits
+        self.windows = {}  # Logger name -> [window start, records passed, records dropped]
+    
+    def filter(self, record):
+        limit = self.limits.get(record.name)
+        if limit is None:
+            return True
+        
+        window = self.windows.get(record.name)
+        if window is None or record.created - window[0] >= 1.0:
+            dropped = window[2] if window else 0
+            window = self.windows[record.name] = [record.created, 0, 0]
+            if dropped:
+                record.msg = f"{record.msg} (+{dropped} similar suppressed)"
+        
+        if window[1] >= limit:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+def setup_logging():
+    """Route all logging through a queue to a rotating log file and the terminal"""
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(LogRateLimiter(LOG_RATE_LIMITS))
+    
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    
+    # Writes whatever is still queued when the game exits
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 # Configure logging for error handling
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.FileHandler('bottle_ops.log'), logging.StreamHandler()])
+log_listener = setup_logging()
+dodge_log = logging.getLogger('gameplay.dodge')
+hit_log = logging.getLogger('gameplay.hit')
 
 # Enhanced Image configuration - now supports all UI elements and animations
 IMAGE_URLS = {
@@ -101,52 +184,129 @@ ANIMATION_CONFIG = {'player_idle': {'fps': 2, 'loop': True},'player_run': {'fps'
 USE_LOCAL_IMAGES = False
 LOCAL_IMAGE_PATHS = {}
 
+# Load images from the bundled graphics/ folder when present, only downloading missing files
+PREFER_BUNDLED_IMAGES = True
+BUNDLED_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graphics')
+
+# Images with these key prefixes are downscaled at load time to the largest size they are drawn at
+DOWNSCALE_IMAGE_PREFIXES = ('background_', 'text_')
+
+# Memory budget for scaled copies of images reused between frames
+SCALED_SURFACE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Pre-rotated bottle sprites: angle granularity in degrees, size granularity (minimum pixels and
+# fraction of the size, so large sprites share buckets) and memory budget
+BOTTLE_ROTATION_STEP = 10
+BOTTLE_SIZE_STEP = 2
+BOTTLE_SIZE_RATIO = 0.08
+ROTATED_SPRITE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Number of rendered text surfaces kept between frames
+TEXT_CACHE_MAX_ENTRIES = 512
+
+# Number of worker threads used to fetch and decode images in parallel
+IMAGE_LOADER_WORKERS = 8
+
+# Persistent on-disk cache for downloaded images
+USE_ASSET_CACHE = True
+ASSET_CACHE_DIR = "asset_cache"
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Headless mode (--headless) runs the game simulation with a bot and no window, for benchmarks and CI
+HEADLESS_MODE = '--headless' in argv
+HEADLESS_STEPS = 3600  # Simulation steps per headless run (one minute of gameplay)
+HEADLESS_BOT = 'dodge'
+if HEADLESS_MODE:
+    # Must be set before pygame initializes the display
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+# Static screens (menus, leaderboard, game over...) redraw only the regions that changed, such as a hovered
+# button, the text cursor or the scrollbar, instead of the whole frame. Off by default
+DIRTY_RECT_RENDERING = False
+IDLE_RENDER_FPS = 10  # Frame rate once a static screen has been unchanged for DIRTY_RECT_IDLE_MS
+DIRTY_RECT_IDLE_MS = 500
+
+# Record every game's input so it can be replayed exactly with --headless --replay
+RECORD_REPLAYS = True
+REPLAY_FILE = "last_game.replay"
+
+# Frame profiler overlay, toggled with F3 in game. F4 saves the recorded frames as PROFILER_DUMP_FILE .csv and .json
+PROFILER_HISTORY_FRAMES = 600  # Rolling window for the percentiles, 10 seconds at 60 FPS
+PROFILER_REFRESH_FRAMES = 30  # The overlay statistics are recomputed this often
+PROFILER_HISTOGRAM_MS = (4, 8, 12, 17, 20, 25, 34, 50, 100)  # Upper edges of the frame time histogram buckets
+PROFILER_DUMP_FILE = "frame_profile"
+
 # ANIMATION AND VISUAL CLASSES
 
-class Animation:
-    """Handles sprite animation with configurable FPS and looping"""
+class FrameSequence:
+    """Immutable animation frames and playback settings, shared by every cursor that plays them"""
+    
+    __slots__ = ('frames', 'fps', 'loop', 'frame_ms', 'duration_ms', 'scaled_frames')
     
     def __init__(self, frames, fps=8, loop=True):
-        self.frames = frames if frames else []
+        self.frames = tuple(frames) if frames else ()
         self.fps = fps
         self.loop = loop
-        self.frame_duration = max(1, 60 // fps) if fps > 0 else 1  # Convert FPS to frame ticks at 60fps
+        self.frame_ms = 1000 / fps if fps > 0 else 1000 / 60
+        self.duration_ms = self.frame_ms * len(self.frames)
         
-        self.current_frame = 0
-        self.frame_timer = 0
-        self.finished = False
+        # Scaled copies of frames keyed by (frame index, size), cleared when the screen size changes
+        self.scaled_frames = {}
+    
+    def get_scaled_frame(self, index, size):
+        """Get a frame scaled to size, scaling it only the first time it is asked for"""
+        key = (index, size)
+        frame = self.scaled_frames.get(key)
+        if frame is None:
+            frame = pg.transform.scale(self.frames[index], size)
+            self.scaled_frames[key] = frame
+        return frame
+    
+    def clear_scaled_frames(self):
+        """Drop all scaled frames"""
+        self.scaled_frames.clear()
+
+class AnimationCursor:
+    """Per-instance playback position in a FrameSequence, advanced by elapsed time"""
+    
+    __slots__ = ('sequence', 'elapsed_ms', 'playing')
+    
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.elapsed_ms = 0.0
         self.playing = True
     
-    def update(self):
-        """Update animation frame"""
-        if not self.playing or not self.frames or self.finished:
-            return
-        
-        self.frame_timer += 1
-        
-        if self.frame_timer >= self.frame_duration:
-            self.frame_timer = 0
-            
-            if self.current_frame < len(self.frames) - 1:
-                self.current_frame += 1
-            else:
-                # Reached the end
-                if self.loop:
-                    self.current_frame = 0  # Loop back to start
-                else:
-                    self.finished = True  # Mark as finished
+    def update(self, dt_ms=None):
+        """Advance playback by dt_ms milliseconds, one simulation step by default"""
+        if self.playing and not self.is_finished():
+            self.elapsed_ms += SIM_STEP_MS if dt_ms is None else dt_ms
     
-    def get_current_frame(self):
-        """Get current animation frame"""
-        if not self.frames or self.current_frame >= len(self.frames):
+    def get_frame_index(self):
+        """Index of the frame to show at the current playback time"""
+        sequence = self.sequence
+        if not sequence.frames:
             return None
-        return self.frames[self.current_frame]
+        index = int(self.elapsed_ms // sequence.frame_ms)
+        if sequence.loop:
+            return index % len(sequence.frames)
+        return min(index, len(sequence.frames) - 1)
     
-    def reset(self):
-        """Reset animation to beginning"""
-        self.current_frame = 0
-        self.frame_timer = 0
-        self.finished = False
+    def get_current_frame(self):
+        """Get current animation frame"""
+        index = self.get_frame_index()
+        return None if index is None else self.sequence.frames[index]
+    
+    def get_scaled_frame(self, size):
+        """Get current animation frame scaled to size, from the sequence's shared cache"""
+        index = self.get_frame_index()
+        return None if index is None else self.sequence.get_scaled_frame(index, size)
+    
+    def reset(self, sequence=None):
+        """Restart playback from the first frame, optionally switching to another sequence"""
+        if sequence is not None:
+            self.sequence = sequence
+        self.elapsed_ms = 0.0
         self.playing = True
     
     def play(self):
@@ -159,20 +319,325 @@ class Animation:
     
     def is_finished(self):
         """Check if animation is finished (only relevant for non-looping animations)"""
-        return self.finished
+        sequence = self.sequence
+        return not sequence.loop and bool(sequence.frames) and self.elapsed_ms >= sequence.duration_ms
     
     def set_frame(self, frame_index):
         """Set specific frame"""
-        if 0 <= frame_index < len(self.frames):
-            self.current_frame = frame_index
-            self.frame_timer = 0
+        if 0 <= frame_index < len(self.sequence.frames):
+            self.elapsed_ms = frame_index * self.sequence.frame_ms
+
+class AssetCache:
+    """Content-addressed on-disk cache for downloaded image data with size-bounded LRU eviction"""
+    
+    def __init__(self, cache_dir=ASSET_CACHE_DIR, max_bytes=ASSET_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        
+        # url -> {'hash': sha256 of the content, 'size': bytes, 'last_used': timestamp}
+        self.entries = {}
+        
+        # Statistics for the current session
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        
+        self.load_index()
+    
+    def load_index(self):
+        """Load the cache index from disk"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    self.entries = json.load(f).get('entries', {})
+                logging.info(f"Asset cache index loaded: {len(self.entries)} entries")
+        except Exception as e:
+            logging.warning(f"Failed to load asset cache index: {e}")
+            self.entries = {}
+    
+    def save_index(self):
+        """Save the cache index to disk"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Held through the replace so concurrent saves never share or truncate the temporary file
+            with self.lock:
+                temp_file = self.index_file + ".tmp"
+                with open(temp_file, 'w') as f:
+                    json.dump({'entries': self.entries}, f, indent=2)
+                os.replace(temp_file, self.index_file)
+        except Exception as e:
+            logging.warning(f"Failed to save asset cache index: {e}")
+    
+    def get_path(self, content_hash):
+        """Get the file path that stores content with the given hash"""
+        return os.path.join(self.cache_dir, f"{content_hash}.bin")
+    
+    def get(self, url):
+        """Get cached data for a URL, or None on a miss"""
+        with self.lock:
+            entry = self.entries.get(url)
+        
+        data = None
+        if entry:
+            try:
+                with open(self.get_path(entry['hash']), 'rb') as f:
+                    data = f.read()
+                # Treat missing or corrupted files as a miss
+                if hashlib.sha256(data).hexdigest() != entry['hash']:
+                    data = None
+            except OSError:
+                data = None
+        
+        with self.lock:
+            if data is None:
+                self.misses += 1
+                if entry:
+                    self.entries.pop(url, None)
+                return None
+            
+            entry['last_used'] = time.time()
+            self.hits += 1
+            self.bytes_saved += len(data)
+            return data
+    
+    def put(self, url, data):
+        """Store downloaded data for a URL and evict old entries if over the size limit, save_index() persists it"""
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self.get_path(content_hash)
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if not os.path.exists(path):
+                # Write to a temporary file first so a crash never leaves a partial entry
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+        except OSError as e:
+            logging.warning(f"Failed to write asset cache entry: {e}")
+            return
+        
+        with self.lock:
+            self.entries[url] = {'hash': content_hash, 'size': len(data), 'last_used': time.time()}
+            self.evict()
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes (lock must be held)"""
+        sizes = {entry['hash']: entry['size'] for entry in self.entries.values()}
+        total_size = sum(sizes.values())
+        
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            if total_size <= self.max_bytes:
+                break
+            
+            del self.entries[url]
+            
+            # Content is shared between URLs with identical data, only delete it once unreferenced
+            if not any(other['hash'] == entry['hash'] for other in self.entries.values()):
+                total_size -= entry['size']
+                try:
+                    os.remove(self.get_path(entry['hash']))
+                except OSError:
+                    pass
+    
+    def get_stats(self):
+        """Get cache statistics as a dictionary"""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes_saved': self.bytes_saved, 'entries': len(self.entries)}
+
+class ScaledSurfaceCache:
+    """LRU cache of scaled copies of images keyed by image key and target size"""
+    
+    def __init__(self, max_bytes=SCALED_SURFACE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (key, size) -> (source image, scaled image, bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, image, size):
+        """Get image scaled to size, scaling it only if no valid cached copy exists"""
+        if image.get_size() == size:
+            return image
+        
+        cache_key = (key, size)
+        entry = self.entries.get(cache_key)
+        
+        # The source image may have been replaced since the entry was made (e.g. refitted on resize)
+        if entry and entry[0] is image:
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        scaled = pg.transform.scale(image, size)
+        
+        if entry:
+            self.total_bytes -= entry[2]
+        size_bytes = size[0] * size[1] * scaled.get_bytesize()
+        self.entries[cache_key] = (image, scaled, size_bytes)
+        self.entries.move_to_end(cache_key)
+        self.total_bytes += size_bytes
+        
+        # Evict least recently used entries, always keeping the newest one
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, evicted_bytes) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+        
+        return scaled
+    
+    def clear(self):
+        """Drop all cached surfaces"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+class RotatedSpriteCache:
+    """LRU cache of scaled and rotated sprites keyed by sprite key, size bucket and angle bucket"""
+    
+    def __init__(self, angle_step=BOTTLE_ROTATION_STEP, size_step=BOTTLE_SIZE_STEP, size_ratio=BOTTLE_SIZE_RATIO, max_bytes=ROTATED_SPRITE_CACHE_MAX_BYTES):
+        self.angle_step = max(1, angle_step)
+        self.size_step = max(1, size_step)
+        self.size_ratio = size_ratio
+        self.angle_buckets = max(1, round(360 / self.angle_step))
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (key, width, height, angle bucket) -> (source, sprite, bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, source, size, angle):
+        """Get source scaled to size and rotated by angle, where source is an image or an RGB color for a plain rectangle"""
+        width = self.quantize_size(size[0])
+        height = self.quantize_size(size[1])
+        angle_bucket = round(angle / self.angle_step) % self.angle_buckets
+        
+        cache_key = (key, width, height, angle_bucket)
+        entry = self.entries.get(cache_key)
+        
+        # The source image may have been replaced (or the color edited) since the entry was made
+        if entry and entry[0] == source:
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        if isinstance(source, pg.Surface):
+            scaled = pg.transform.scale(source, (width, height))
+        else:
+            scaled = pg.Surface((width, height), pg.SRCALPHA)
+            scaled.fill(source)
+        sprite = pg.transform.rotate(scaled, angle_bucket * 360 / self.angle_buckets)
+        
+        if entry:
+            self.total_bytes -= entry[2]
+        size_bytes = sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+        self.entries[cache_key] = (source, sprite, size_bytes)
+        self.entries.move_to_end(cache_key)
+        self.total_bytes += size_bytes
+        
+        # Evict least recently used sprites, always keeping the newest one
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, evicted_bytes) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+        
+        return sprite
+    
+    def quantize_size(self, value):
+        """Round a sprite dimension to its size bucket"""
+        step = max(self.size_step, int(value * self.size_ratio))
+        return max(1, round(value / step) * step)
+    
+    def clear(self):
+        """Drop all cached sprites"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+class TextRenderCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color, antialias)"""
+    
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.glyphs = {}  # (font, character, color, antialias) -> Surface, for composing numbers
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, key):
+        """Get a cached surface and mark it as recently used, or None"""
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return surface
+    
+    def store(self, key, surface):
+        """Add a surface, evicting the least recently used one when full"""
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def render(self, font, text, antialias, color):
+        """Same as font.render(text, antialias, color), but reuses earlier renders"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.lookup(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.store(key, surface)
+        return surface
+    
+    def render_number(self, font, prefix, number_text, antialias, color):
+        """Render prefix followed by number_text, composing the number from cached glyphs instead of a full render"""
+        color = tuple(color)
+        key = (font, prefix + number_text, color, antialias)
+        surface = self.lookup(key)
+        if surface is not None:
+            return surface
+        
+        parts = [self.render(font, prefix, antialias, color)] if prefix else []
+        for character in number_text:
+            glyph_key = (font, character, color, antialias)
+            glyph = self.glyphs.get(glyph_key)
+            if glyph is None:
+                glyph = font.render(character, antialias, color)
+                self.glyphs[glyph_key] = glyph
+            parts.append(glyph)
+        
+        surface = pg.Surface((sum(part.get_width() for part in parts), font.get_height()), pg.SRCALPHA)
+        x = 0
+        for part in parts:
+            # Parts don't overlap, so max blending copies each one exactly onto the transparent surface
+            surface.blit(part, (x, 0), special_flags=pg.BLEND_RGBA_MAX)
+            x += part.get_width()
+        
+        self.store(key, surface)
+        return surface
+    
+    def get_stats(self):
+        """Get cache usage statistics"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'glyphs': len(self.glyphs),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+    
+    def clear(self):
+        """Drop all cached text"""
+        self.entries.clear()
+        self.glyphs.clear()
 
 class ImageManager:
     """Enhanced image manager with animation support"""
     
     def __init__(self):
         self.images = {}
-        self.animations = {}
+        self.frame_sequences = {}
+        self.animations = {}  # Shared cursors for the single player and drunk guy
+        self.character_frames = {}  # (key, frame index, size, flipped, translucent) -> Surface
         self.loading_threads = {}
         self.loading_complete = False
         self.fallback_mode = False
@@ -181,80 +646,117 @@ class ImageManager:
         self.total_assets = 0
         self.loaded_assets = 0
         self.loading_progress = 0.0
+        self.progress_lock = threading.Lock()
+        
+        # On-disk cache for images downloaded from the web
+        self.asset_cache = AssetCache() if USE_ASSET_CACHE else None
+        
+        # Per-asset load source and timing
+        self.asset_report = {}
+        
+        # Original sources and sizes of images, used to re-derive downscaled images on resize
+        self.image_sources = {}
+        self.native_sizes = {}
+        self.refit_pending = False
+        self.refit_generation = 0
+        self.images_version = 0  # Bumped whenever images change, so cached screens know to redraw
+        
+        # Scaled copies of images shared by the drawing code
+        self.scaled_cache = ScaledSurfaceCache()
+        self.sprite_cache = RotatedSpriteCache()
         
         # Start loading images in background
         self.start_image_loading()
     
     def start_image_loading(self):
-        """Start background thread to load all images and create animations"""
+        """Start background thread that loads all images on a worker pool and creates animations"""
         def load_all_images():
             try:
-                # Calculate total assets to load
-                self.total_assets = 0
-                
-                # Count single images
                 single_images = ['background_menu', 'background_game', 'background_settings', 
                                'background_leaderboard', 'text_title', 'text_play', 'text_settings', 'text_bottle_config',
                                'text_leaderboard', 'text_quit', 'text_main_menu', 'text_clear', 'text_back', 'text_game_over',
                                'button_normal', 'button_hover']
+                animation_sequences = ['player_idle', 'player_run', 'player_jump', 'drunk_idle', 'drunk_left_throw', 'drunk_right_throw','effect_shatter', 'effect_explosion']
                 
+                # Build the full list of (key, url) jobs up front so progress has a fixed total
+                jobs = []
                 for key in single_images:
                     if key in IMAGE_URLS and IMAGE_URLS[key]:
-                        self.total_assets += 1
-                
-                # Count animation frames
-                animation_sequences = ['player_idle', 'player_run', 'player_jump', 'drunk_idle', 'drunk_left_throw', 'drunk_right_throw','effect_shatter', 'effect_explosion']
+                        jobs.append((key, IMAGE_URLS[key]))
                 
+                sequence_keys = {}
                 for seq_key in animation_sequences:
                     if seq_key in IMAGE_URLS:
-                        self.total_assets += len(IMAGE_URLS[seq_key])
+                        sequence_keys[seq_key] = [f"{seq_key}_frame_{i}" for i in range(len(IMAGE_URLS[seq_key]))]
+                        jobs.extend(zip(sequence_keys[seq_key], IMAGE_URLS[seq_key]))
                 
-                # Count bottle images
                 for bottle_id, url in IMAGE_URLS['bottles'].items():
                     if url:
-                        self.total_assets += 1
+                        jobs.append((f'bottle_{bottle_id}', url))
                 
-                logging.info(f"Total assets to load: {self.total_assets}")
+                # Group keys by source so each unique file is fetched and decoded only once
+                source_keys = {}
+                for key, url in jobs:
+                    source_keys.setdefault(self.get_image_source(key, url), []).append(key)
                 
-                # Load single images
-                for key in single_images:
-                    if key in IMAGE_URLS and IMAGE_URLS[key]:
-                        self.load_image(key, IMAGE_URLS[key])
-                        self.loaded_assets += 1
-                        self.loading_progress = self.loaded_assets / self.total_assets
+                with self.progress_lock:
+                    self.total_assets = len(source_keys)
+                    self.loaded_assets = 0
+                    self.loading_progress = 0.0
                 
-                # Load animation sequences
-                for seq_key in animation_sequences:
-                    if seq_key in IMAGE_URLS:
-                        frames = []
-                        for i, url in enumerate(IMAGE_URLS[seq_key]):
-                            frame_key = f"{seq_key}_frame_{i}"
-                            self.load_image(frame_key, url)
-                            self.loaded_assets += 1
-                            self.loading_progress = self.loaded_assets / self.total_assets
-                            if frame_key in self.images and self.images[frame_key]:
-                                frames.append(self.images[frame_key])
+                workers = max(1, IMAGE_LOADER_WORKERS)
+                logging.info(f"Total assets to load: {self.total_assets} unique of {len(jobs)} ({workers} workers)")
+                
+                # Fetch and decode every unique asset concurrently
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-loader') as pool:
+                    futures = {}
+                    for source, keys in source_keys.items():
+                        future = pool.submit(self.load_asset, keys, source)
+                        for key in keys:
+                            futures[key] = future
+                    
+                    # Create animations in ANIMATION_CONFIG order as soon as their frames have arrived
+                    for seq_key, frame_keys in sequence_keys.items():
+                        for frame_key in frame_keys:
+                            futures[frame_key].result()
                         
-                        # Create animation with proper config
+                        frames = [self.images[frame_key] for frame_key in frame_keys if self.images.get(frame_key)]
                         if frames and seq_key in ANIMATION_CONFIG:
                             config = ANIMATION_CONFIG[seq_key]
-                            self.animations[seq_key] = Animation(
+                            sequence = FrameSequence(
                                 frames, 
                                 fps=config['fps'], 
                                 loop=config['loop']
                             )
+                            self.frame_sequences[seq_key] = sequence
+                            self.animations[seq_key] = AnimationCursor(sequence)
+                    
+                    # Wait for the remaining single images and bottles
+                    for future in set(futures.values()):
+                        future.result()
                 
-                # Load bottle images
-                for bottle_id, url in IMAGE_URLS['bottles'].items():
-                    if url:
-                        self.load_image(f'bottle_{bottle_id}', url)
-                        self.loaded_assets += 1
-                        self.loading_progress = self.loaded_assets / self.total_assets
+                source_counts = {}
+                for entry in self.asset_report.values():
+                    source_counts[entry['source']] = source_counts.get(entry['source'], 0) + 1
+                logging.info("Asset sources: " + ", ".join(f"{origin}={count}" for origin, count in sorted(source_counts.items())))
                 
-                self.loading_complete = True
-                self.loading_progress = 1.0
+                if self.asset_cache:
+                    self.asset_cache.save_index()
+                    stats = self.asset_cache.get_stats()
+                    logging.info(f"Asset cache: {stats['hits']} hits, {stats['misses']} misses, {stats['bytes_saved']} bytes saved")
+                
+                # Completion and the pending refit are checked together, refit_images() sets them under the same lock
+                with self.progress_lock:
+                    self.loading_complete = True
+                    self.loading_progress = 1.0
+                    refit_pending = self.refit_pending
+                    self.refit_pending = False
                 logging.info("All images and animations loaded successfully")
                 
+                # The display was resized while loading
+                if refit_pending:
+                    self.refit_images()
+                
             except Exception as e:
                 logging.error(f"Error loading images: {e}")
                 self.fallback_mode = True
@@ -263,24 +765,43 @@ class ImageManager:
         thread = threading.Thread(target=load_all_images, daemon=True)
         thread.start()
     
+    def load_asset(self, keys, source):
+        """Load one unique asset on a worker thread and advance the shared progress counters"""
+        self.load_shared_image(keys, source)
+        
+        with self.progress_lock:
+            self.loaded_assets += 1
+            if self.total_assets:
+                self.loading_progress = self.loaded_assets / self.total_assets
+    
     def load_image_from_url(self, url):
-        """Load image from raw URL using urllib"""
+        """Load image from raw URL using urllib, reading from the on-disk cache when possible.
+        Returns (image, origin) where origin is 'cache' or 'network'"""
+        from_cache = False
         try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
+            image_data = self.asset_cache.get(url) if self.asset_cache else None
+            from_cache = image_data is not None
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                image_data = response.read()
+            if not from_cache:
+                req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
+                
+                with urllib.request.urlopen(req, timeout=10) as response:
+                    image_data = response.read()
             
             image = pg.image.load(BytesIO(image_data))
             if image.get_alpha() is None:
                 image = image.convert()
             else:
                 image = image.convert_alpha()
-            return image
+            
+            # Only cache data that decoded successfully
+            if self.asset_cache and not from_cache:
+                self.asset_cache.put(url, image_data)
+            return image, 'cache' if from_cache else 'network'
             
         except Exception as e:
             logging.warning(f"Failed to load image from URL: {e}")
-            return None
+            return None, 'cache' if from_cache else 'network'
     
     def load_image_from_data_url(self, data_url):
         """Load image from data URL"""
@@ -301,67 +822,192 @@ class ImageManager:
             logging.warning(f"Failed to load image from data URL: {e}")
             return None
     
-    def load_image(self, key, url):
-        """Load a single image from URL, data URL, or local file"""
+    def get_bundled_image_path(self, url):
+        """Map a repository URL to its copy in the bundled graphics/ tree, or None if it isn't shipped"""
+        if not url or not url.startswith(('http://', 'https://')):
+            return None
+        
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(url).path)
+        if '/graphics/' not in url_path:
+            return None
+        
+        relative_path = url_path.split('/graphics/', 1)[1]
+        local_path = os.path.join(BUNDLED_IMAGE_DIR, *relative_path.split('/'))
+        return local_path if os.path.isfile(local_path) else None
+    
+    def get_image_source(self, key, url):
+        """Get the location an image will actually be loaded from (local override, bundled file or URL)"""
+        if USE_LOCAL_IMAGES and key in LOCAL_IMAGE_PATHS and os.path.exists(LOCAL_IMAGE_PATHS[key]):
+            return LOCAL_IMAGE_PATHS[key]
+        
+        # Prefer the copy shipped in graphics/ and only go to the network for missing files
+        if PREFER_BUNDLED_IMAGES:
+            bundled_path = self.get_bundled_image_path(url)
+            if bundled_path:
+                return bundled_path
+        
+        return url
+    
+    def load_image_from_source(self, source):
+        """Load an image from a URL, data URL, or local file.
+        Returns (image, origin) where image is None on failure"""
+        # Skip if no source provided
+        if not source:
+            return None, 'none'
+        
+        # Handle different URL types
+        if source.startswith('data:'):
+            return self.load_image_from_data_url(source), 'data URL'
+        
+        elif source.startswith(('http://', 'https://')):
+            return self.load_image_from_url(source)
+        
+        elif os.path.exists(source):
+            image = pg.image.load(source)
+            if image.get_alpha() is None:
+                image = image.convert()
+            else:
+                image = image.convert_alpha()
+            
+            if os.path.abspath(source).startswith(BUNDLED_IMAGE_DIR + os.sep):
+                return image, 'bundled'
+            return image, 'file'
+        
+        return None, 'none'
+    
+    def load_shared_image(self, keys, source):
+        """Load an image source once and share the resulting surface across every key that uses it"""
+        start = time.perf_counter()
         try:
-            # Try local image first if enabled
-            if USE_LOCAL_IMAGES and key in LOCAL_IMAGE_PATHS:
-                local_path = LOCAL_IMAGE_PATHS[key]
-                if os.path.exists(local_path):
-                    image = pg.image.load(local_path)
-                    if image.get_alpha() is None:
-                        image = image.convert()
-                    else:
-                        image = image.convert_alpha()
-                    self.images[key] = image
-                    logging.info(f"Loaded local image: {key}")
-                    return
+            image, origin = self.load_image_from_source(source)
+        except Exception as e:
+            logging.warning(f"Failed to load image {keys[0]}: {e}")
+            image, origin = None, 'error'
+        load_ms = (time.perf_counter() - start) * 1000
+        
+        for key in keys:
+            self.image_sources[key] = source
+            self.asset_report[key] = {'source': origin if image else 'failed', 'location': source, 'load_ms': load_ms}
+        
+        self.store_fitted_images(keys, image)
+        
+        if image:
+            logging.info(f"Loaded image: {', '.join(keys)} from {origin} in {load_ms:.1f} ms")
+        elif not source:
+            logging.info(f"No URL provided for {', '.join(keys)}")
+        else:
+            logging.warning(f"Could not load image {', '.join(keys)} from: {source}")
+    
+    def get_display_size(self, key, native_size):
+        """Get the largest size an image is drawn at on the current display, never larger than its native size"""
+        native_width, native_height = native_size
+        
+        if key.startswith('background_'):
+            # Backgrounds are stretched to fill the screen
+            return min(native_width, SCREEN_WIDTH), min(native_height, SCREEN_HEIGHT)
+        
+        if key.startswith('text_'):
+            scale_x = SCREEN_WIDTH / BASE_WIDTH
+            scale_y = SCREEN_HEIGHT / BASE_HEIGHT
             
-            # Skip if no URL provided
-            if not url:
-                logging.info(f"No URL provided for {key}")
+            # Largest of the title scale used by the loading screen and the fit inside the biggest button
+            title_scale = min(scale_x, scale_y) / 10
+            button_width = max(160, int(200 * scale_x))
+            button_height = max(30, int(50 * scale_y))
+            button_scale = min((button_width - 20) / native_width, (button_height - 10) / native_height)
+            
+            scale = min(1.0, max(title_scale, button_scale))
+            return max(1, math.ceil(native_width * scale)), max(1, math.ceil(native_height * scale))
+        
+        return native_width, native_height
+    
+    def store_fitted_images(self, keys, image):
+        """Store an image under each key, downscaled once to the largest size that key is drawn at"""
+        fitted = {}
+        
+        for key in keys:
+            if image is None:
                 self.images[key] = None
-                return
+                continue
             
-            # Handle different URL types
-            if url.startswith('data:'):
-                image = self.load_image_from_data_url(url)
-                if image:
-                    self.images[key] = image
-                    logging.info(f"Loaded image from data URL: {key}")
-                    return
-                else:
-                    logging.warning(f"Failed to load data URL for {key}")
-                    self.images[key] = None
-                    return
+            native_size = image.get_size()
+            self.native_sizes[key] = native_size
             
-            elif url.startswith(('http://', 'https://')):
-                image = self.load_image_from_url(url)
-                if image:
-                    self.images[key] = image
-                    logging.info(f"Loaded image from web URL: {key}")
-                    return
-                else:
-                    logging.warning(f"Failed to load web URL for {key}")
-                    self.images[key] = None
-                    return
+            target_size = native_size
+            if key.startswith(DOWNSCALE_IMAGE_PREFIXES):
+                target_size = self.get_display_size(key, native_size)
             
-            elif os.path.exists(url):
-                image = pg.image.load(url)
-                if image.get_alpha() is None:
-                    image = image.convert()
+            # Keys sharing a source and target size share the same surface
+            if target_size not in fitted:
+                if target_size == native_size:
+                    fitted[target_size] = image
                 else:
-                    image = image.convert_alpha()
-                self.images[key] = image
-                logging.info(f"Loaded image from file path: {key}")
-                return
+                    try:
+                        fitted[target_size] = pg.transform.smoothscale(image, target_size)
+                    except ValueError:
+                        # smoothscale only supports 24 and 32 bit surfaces
+                        fitted[target_size] = pg.transform.scale(image, target_size)
             
-            logging.warning(f"Could not load image {key} from URL: {url}")
-            self.images[key] = None
+            self.images[key] = fitted[target_size]
+        
+        self.images_version += 1
+    
+    def refit_images(self):
+        """Re-derive downscaled images from their sources after the display size changes"""
+        with self.progress_lock:
+            if not self.loading_complete:
+                # The loader refits everything itself once it finishes
+                self.refit_pending = True
+                return
+            self.refit_generation += 1
+            generation = self.refit_generation
+        
+        # Only reload sources where at least one key now needs a different size
+        source_keys = {}
+        for key, source in self.image_sources.items():
+            image = self.images.get(key)
+            if image is None or not key.startswith(DOWNSCALE_IMAGE_PREFIXES):
+                continue
+            if image.get_size() != self.get_display_size(key, self.native_sizes[key]):
+                source_keys.setdefault(source, []).append(key)
+        
+        if not source_keys:
+            return
+        
+        def refit_all():
+            for source, keys in source_keys.items():
+                try:
+                    image, origin = self.load_image_from_source(source)
+                except Exception as e:
+                    logging.warning(f"Failed to reload image {keys[0]}: {e}")
+                    continue
+                
+                # A newer resize has superseded this one
+                if generation != self.refit_generation:
+                    return
+                if image:
+                    self.store_fitted_images(keys, image)
             
-        except Exception as e:
-            logging.warning(f"Failed to load image {key}: {e}")
-            self.images[key] = None
+            logging.info(f"Refitted {sum(len(keys) for keys in source_keys.values())} images to {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        
+        # Decoding full size sources is slow, so keep drawing the old images until this finishes
+        thread = threading.Thread(target=refit_all, daemon=True)
+        thread.start()
+    
+    def get_native_size(self, key):
+        """Get the original size of an image before any load-time downscaling"""
+        if key in self.native_sizes:
+            return self.native_sizes[key]
+        image = self.images.get(key)
+        return image.get_size() if image else None
+    
+    def load_image(self, key, url):
+        """Load a single image from URL, data URL, or local file"""
+        self.load_shared_image([key], self.get_image_source(key, url))
+    
+    def get_asset_report(self):
+        """Get per-asset load source and load time, keyed by image key"""
+        return dict(self.asset_report)
     
     def get_image(self, key, fallback_surface=None):
         """Get an image, return fallback surface if image not available"""
@@ -369,13 +1015,62 @@ class ImageManager:
             return self.images[key]
         return fallback_surface
     
+    def get_scaled_image(self, key, size):
+        """Get an image scaled to size (width, height) from the shared cache, or None if not available"""
+        image = self.get_image(key)
+        if image is None:
+            return None
+        return self.scaled_cache.get(key, image, (int(size[0]), int(size[1])))
+    
+    def get_rotated_sprite(self, key, source, size, angle):
+        """Get a scaled and rotated sprite from the shared cache, source is an image or an RGB color"""
+        return self.sprite_cache.get(key, source, (int(size[0]), int(size[1])), angle)
+    
+    def clear_scaled_images(self):
+        """Invalidate all cached scaled images and sprites (e.g. after the screen size changes).
+        Character frames are kept, get_scaled_values() clears them only when the character sizes change"""
+        self.scaled_cache.clear()
+        self.sprite_cache.clear()
+        for sequence in list(self.frame_sequences.values()):
+            sequence.clear_scaled_frames()
+    
+    def get_character_frame(self, key, index, size, flipped=False, translucent=False):
+        """Get an animation frame pre-scaled to a character's size, optionally mirrored and translucent"""
+        cache_key = (key, index, size, flipped, translucent)
+        frame = self.character_frames.get(cache_key)
+        if frame is None:
+            sequence = self.frame_sequences.get(key)
+            if sequence is None or index is None:
+                return None
+            
+            if flipped or translucent:
+                # Derive variants from the plain scaled frame so it is only scaled once
+                frame = self.get_character_frame(key, index, size)
+                if flipped:
+                    frame = pg.transform.flip(frame, True, False)
+                if translucent:
+                    frame = frame.copy()
+                    frame.set_alpha(180)
+            else:
+                frame = pg.transform.scale(sequence.frames[index], size)
+            self.character_frames[cache_key] = frame
+        return frame
+    
+    def clear_character_frames(self):
+        """Drop the pre-scaled character frames, e.g. after the character sizes change"""
+        self.character_frames.clear()
+    
+    def get_frame_sequence(self, key):
+        """Get the shared frames of an animation, to play with a separate AnimationCursor"""
+        return self.frame_sequences.get(key)
+    
     def get_animation(self, key):
-        """Get an animation object"""
+        """Get the shared animation cursor for the player and drunk guy"""
         return self.animations.get(key)
     
     def update_animations(self):
-        """Update all animations"""
-        for animation in self.animations.values():
+        """Advance the shared animation cursors by one simulation step"""
+        for animation in list(self.animations.values()):
             animation.update()
     
     def is_loading(self):
@@ -397,18 +1092,29 @@ class ImageManager:
 class VisualEffect:
     """Handles visual effects like explosions and shattering"""
     
+    __slots__ = ('x', 'y', 'effect_type', 'image_manager', 'animation', 'active', 'scale_factor')
+    
     def __init__(self, x, y, effect_type, image_manager):
+        self.reset(x, y, effect_type, image_manager)
+    
+    def reset(self, x, y, effect_type, image_manager):
+        """Initialize the effect, also used when it is reused from a pool"""
         self.x = x
         self.y = y
         self.effect_type = effect_type
         self.image_manager = image_manager
-        self.animation = image_manager.get_animation(f'effect_{effect_type}')
         
-        if self.animation:
-            self.animation.reset()
+        # Each effect plays the shared frames with its own cursor, so simultaneous effects don't interfere
+        sequence = image_manager.get_frame_sequence(f'effect_{effect_type}')
+        if sequence is None:
+            self.animation = None
+        elif getattr(self, 'animation', None):
+            self.animation.reset(sequence)
+        else:
+            self.animation = AnimationCursor(sequence)
         
         self.active = True
-        self.scale_factor = random.uniform(0.8, 1.2)  # Random size variation
+        self.scale_factor = game_rng.uniform(0.8, 1.2)  # Random size variation
     
     def update(self):
         """Update effect animation"""
@@ -433,15 +1139,14 @@ class VisualEffect:
             return
         
         if self.animation:
-            frame = self.animation.get_current_frame()
-            if frame:
-                # Scale the effect
-                scale_x = SCREEN_WIDTH / BASE_WIDTH
-                scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-                base_size = max(20, int(40 * min(scale_x, scale_y)))
-                size = int(base_size * self.scale_factor)
-                
-                scaled_frame = pg.transform.scale(frame, (size, size))
+            # Scale the effect
+            scale_x = SCREEN_WIDTH / BASE_WIDTH
+            scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+            base_size = max(20, int(40 * min(scale_x, scale_y)))
+            size = int(base_size * self.scale_factor)
+            
+            scaled_frame = self.animation.get_scaled_frame((size, size))
+            if scaled_frame:
                 rect = scaled_frame.get_rect(center=(int(self.x), int(self.y)))
                 surface.blit(scaled_frame, rect.topleft)
         else:
@@ -466,7 +1171,14 @@ class VisualEffect:
 
 class ScorePopup:
     """Visual feedback for scoring events"""
+    
+    __slots__ = ('x', 'y', 'text', 'color', 'font', 'alpha', 'timer', 'max_time', 'y_offset', 'surface')
+    
     def __init__(self, x, y, text, color, font):
+        self.reset(x, y, text, color, font)
+    
+    def reset(self, x, y, text, color, font):
+        """Initialize the popup, also used when it is reused from a pool"""
         self.x = x
         self.y = y
         self.text = text
@@ -476,6 +1188,7 @@ class ScorePopup:
         self.timer = 0
         self.max_time = 90  # 1.5 seconds at 60 FPS
         self.y_offset = 0
+        self.surface = None
         
     def update(self):
         """Update popup animation"""
@@ -493,10 +1206,12 @@ class ScorePopup:
         if self.alpha <= 0:
             return
             
-        text_surface = self.font.render(self.text, True, self.color)
-        text_surface.set_alpha(self.alpha)
+        # Fading changes the surface alpha, so the popup keeps its own copy of the shared cached text
+        if self.surface is None:
+            self.surface = text_cache.render(self.font, self.text, True, self.color).copy()
+        self.surface.set_alpha(self.alpha)
         
-        surface.blit(text_surface, (self.x, self.y + self.y_offset))
+        surface.blit(self.surface, (self.x, self.y + self.y_offset))
 
 # BOTTLE CONFIGURATION SYSTEM
 
@@ -684,14 +1399,62 @@ class BottleTypeConfig:
         """Get configuration for a specific bottle type"""
         return self.bottle_types.get(bottle_id, self.bottle_types[1])
     
+    def rebuild_spawn_table(self):
+        """Build the alias table used to draw bottle types in O(1), call whenever spawn_weights change"""
+        bottle_ids = list(self.spawn_weights.keys())
+        weights = [max(0.0, float(w)) for w in self.spawn_weights.values()]
+        n = len(bottle_ids)
+        total = sum(weights)
+        if total <= 0:
+            logging.warning("All spawn weights are zero, spawning bottle types uniformly")
+            weights = [1.0] * n
+            total = float(n)
+        
+        # Vose's alias method: every column holds its own id with probability prob[i], otherwise alias[i]
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            under, over = small.pop(), large.pop()
+            prob[under] = scaled[under]
+            alias[under] = over
+            scaled[over] -= 1.0 - scaled[under]
+            (small if scaled[over] < 1.0 else large).append(over)
+        
+        self.spawn_ids = bottle_ids
+        self.spawn_prob = prob
+        self.spawn_alias = [bottle_ids[i] for i in alias]
+    
     def get_random_bottle_type(self):
         """Get random bottle type based on spawn weights"""
-        bottle_ids = list(self.spawn_weights.keys())
-        weights = list(self.spawn_weights.values())
-        return random.choices(bottle_ids, weights=weights, k=1)[0]
+        # One draw picks both the column and the coin flip within it
+        x = game_rng.random() * len(self.spawn_ids)
+        column = int(x)
+        if x - column < self.spawn_prob[column]:
+            return self.spawn_ids[column]
+        return self.spawn_alias[column]
+    
+    def get_random_bottle_types(self, count):
+        """Get several random bottle types at once, e.g. to pre-generate a spawn queue"""
+        ids, prob, alias = self.spawn_ids, self.spawn_prob, self.spawn_alias
+        n = len(ids)
+        types = []
+        for _ in range(count):
+            x = game_rng.random() * n
+            column = int(x)
+            types.append(ids[column] if x - column < prob[column] else alias[column])
+        return types
+    
+    def get_checksum(self):
+        """Checksum of the bottle types and spawn weights, replays are only exact with the same configuration"""
+        data = json.dumps({'bottle_types': self.bottle_types, 'spawn_weights': self.spawn_weights}, sort_keys=True)
+        return zlib.crc32(data.encode('utf-8'))
     
     def save_config(self):
         """Save bottle configuration to file"""
+        self.rebuild_spawn_table()
         try:
             with open(self.config_file, 'w') as f:
                 json.dump({
@@ -718,6 +1481,8 @@ class BottleTypeConfig:
                 logging.info("Bottle configuration loaded")
         except Exception as e:
             logging.error(f"Failed to load bottle config: {e}")
+        
+        self.rebuild_spawn_table()
 
 # GAME MANAGEMENT CLASSES
 
@@ -786,6 +1551,270 @@ class LeaderboardManager:
             self.save_scores()
             logging.info("Added 20 default scores to leaderboard")
 
+class ObjectPool:
+    """Free list of reusable game objects, re-initialized through their reset() method"""
+    
+    def __init__(self, factory, max_size=256):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+    
+    def acquire(self, *args):
+        """Get an object initialized with args, reusing a released one when available"""
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        
+        self.misses += 1
+        return self.factory(*args)
+    
+    def release(self, obj):
+        """Return an object that is no longer live so it can be reused"""
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+    
+    def get_stats(self):
+        """Get hit/miss counters and the current free list size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'free': len(self.free)
+        }
+
+class FrameProfiler:
+    """Per-frame timings of the game loop stages, with rolling percentiles, an overlay and CSV/JSON dumps"""
+    
+    # Stages in the order a frame runs them, lap() charges the time since the previous lap to one of them
+    STAGES = ('input', 'physics', 'spawning', 'bottles', 'effects', 'background', 'sprites', 'bottle_draw', 'hud', 'flip')
+    
+    def __init__(self, history=PROFILER_HISTORY_FRAMES):
+        self.enabled = False
+        self.frames = deque(maxlen=history)  # (frame interval ms, stage ms...) per frame
+        self.stage_ms = dict.fromkeys(self.STAGES, 0.0)
+        self.frame_start = None
+        self.last_lap = 0.0
+        self.frames_since_refresh = 0
+        self.summary = None
+        self.overlay = None
+    
+    def toggle(self):
+        """Turn collection and the overlay on or off"""
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.frame_start = None
+        self.summary = None
+        self.overlay = None
+        logging.info(f"Frame profiler {'enabled' if self.enabled else 'disabled'}")
+    
+    def next_frame(self):
+        """Close the previous frame, whose length is the time between two calls, and start timing a new one"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frames.append(((now - self.frame_start) * 1000,) + tuple(self.stage_ms[stage] for stage in self.STAGES))
+            self.frames_since_refresh += 1
+        for stage in self.STAGES:
+            self.stage_ms[stage] = 0.0
+        self.frame_start = now
+        self.last_lap = now
+    
+    def lap(self, stage):
+        """Charge the time since the previous lap to a stage"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stage_ms[stage] += (now - self.last_lap) * 1000
+        self.last_lap = now
+    
+    @staticmethod
+    def percentile(sorted_values, percent):
+        """Nearest rank percentile of an already sorted list"""
+        return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+    
+    def get_summary(self):
+        """Percentiles of the frame time and every stage, and a frame time histogram, over the rolling window"""
+        if not self.frames:
+            return None
+        
+        summary = {'frames': len(self.frames)}
+        for column, name in enumerate(('frame',) + self.STAGES):
+            values = sorted(frame[column] for frame in self.frames)
+            summary[name] = {
+                'mean': round(sum(values) / len(values), 3),
+                'p50': round(self.percentile(values, 50), 3),
+                'p95': round(self.percentile(values, 95), 3),
+                'p99': round(self.percentile(values, 99), 3),
+                'max': round(values[-1], 3)
+            }
+        
+        # Bucket counts keyed by upper edge in ms, the last bucket is everything slower
+        histogram = dict.fromkeys([str(edge) for edge in PROFILER_HISTOGRAM_MS] + ['slower'], 0)
+        for frame in self.frames:
+            for edge in PROFILER_HISTOGRAM_MS:
+                if frame[0] < edge:
+                    histogram[str(edge)] += 1
+                    break
+            else:
+                histogram['slower'] += 1
+        summary['histogram'] = histogram
+        return summary
+    
+    def draw(self, surface):
+        """Draw the overlay, its statistics are only recomputed every PROFILER_REFRESH_FRAMES frames"""
+        if not self.enabled:
+            return
+        
+        if self.overlay is None or self.frames_since_refresh >= PROFILER_REFRESH_FRAMES:
+            self.frames_since_refresh = 0
+            self.summary = self.get_summary()
+            self.overlay = self.render_overlay(self.summary)
+        surface.blit(self.overlay, (10, SCREEN_HEIGHT - self.overlay.get_height() - 10))
+    
+    def render_overlay(self, summary):
+        """Render the statistics panel once, it is blitted as is until the next refresh"""
+        line_height = font_small.get_linesize()
+        lines = ["Frame profiler (F3 hide, F4 save)"]
+        if summary:
+            frame = summary['frame']
+            lines.append(f"frame ms  p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f}")
+            for stage in self.STAGES:
+                lines.append(f"{stage:<12} {summary[stage]['mean']:6.2f}  p95 {summary[stage]['p95']:6.2f}")
+        else:
+            lines.append("collecting...")
+        
+        histogram_height = 40
+        width = 320
+        panel = pg.Surface((width, line_height * len(lines) + histogram_height + 20), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, line in enumerate(lines):
+            panel.blit(font_small.render(line, True, WHITE), (8, 5 + i * line_height))
+        
+        # Frame time histogram, one bar per bucket from fastest to slowest
+        if summary:
+            counts = list(summary['histogram'].values())
+            bar_width = (width - 16) // len(counts)
+            base_y = panel.get_height() - 8
+            for i, count in enumerate(counts):
+                bar_height = int(histogram_height * count / max(counts))
+                color = GREEN if i < 4 else YELLOW if i < 6 else RED  # Buckets up to 17 ms make 60 FPS
+                pg.draw.rect(panel, color, (8 + i * bar_width, base_y - bar_height, bar_width - 2, bar_height))
+        return panel
+    
+    def dump(self, filename):
+        """Write the recorded frames to filename.csv and a summary plus the frames to filename.json"""
+        columns = ('frame_ms',) + tuple(f"{stage}_ms" for stage in self.STAGES)
+        try:
+            with open(f"{filename}.csv", 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for frame in self.frames:
+                    writer.writerow([round(value, 3) for value in frame])
+            
+            with open(f"{filename}.json", 'w') as f:
+                json.dump({
+                    'summary': self.get_summary(),
+                    'frames': [dict(zip(columns, (round(value, 3) for value in frame))) for frame in self.frames]
+                }, f, indent=2)
+            
+            logging.info(f"Frame profile saved: {filename}.csv, {filename}.json ({len(self.frames)} frames)")
+        except Exception as e:
+            logging.error(f"Error saving frame profile: {e}")
+
+class ReplayRecorder:
+    """Compact binary recording of per-tick player input, run-length encoded"""
+    
+    # The simulation only depends on the seeded game RNG, the input and fixed ticks, so the seed plus
+    # the input is enough to re-run a game exactly
+    MAGIC = b'BOPR'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHIHHBI')  # magic, version, seed, width, height, flags, bottle config checksum
+    RUN = struct.Struct('<BH')  # input bitmask, ticks
+    MAX_RUN = 0xFFFF
+    
+    FLAG_VECTORIZED = 1
+    
+    def __init__(self, seed, width, height, flags=0, config_checksum=0):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.flags = flags
+        self.config_checksum = config_checksum
+        self.runs = []  # [bitmask, count] pairs
+        self.tick_count = 0
+    
+    @staticmethod
+    def encode_controls(controls):
+        """Pack (move_left, move_right, jump) into a bitmask"""
+        move_left, move_right, jump = controls
+        return (1 if move_left else 0) | (2 if move_right else 0) | (4 if jump else 0)
+    
+    @staticmethod
+    def decode_controls(mask):
+        """Unpack a bitmask into (move_left, move_right, jump)"""
+        return (bool(mask & 1), bool(mask & 2), bool(mask & 4))
+    
+    def record(self, controls):
+        """Append one tick of input"""
+        mask = self.encode_controls(controls)
+        if self.runs and self.runs[-1][0] == mask and self.runs[-1][1] < self.MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.tick_count += 1
+    
+    def iter_controls(self):
+        """Yield the recorded input one tick at a time"""
+        for mask, count in self.runs:
+            controls = self.decode_controls(mask)
+            for _ in range(count):
+                yield controls
+    
+    def to_bytes(self):
+        """Serialize the header and input runs"""
+        data = bytearray(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.width, self.height,
+                                          self.flags, self.config_checksum))
+        for mask, count in self.runs:
+            data += self.RUN.pack(mask, count)
+        return bytes(data)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse a recording, raising ValueError if it is not a valid replay"""
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Replay file is too short")
+        magic, version, seed, width, height, flags, config_checksum = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a Bottle Ops replay or unsupported version")
+        
+        replay = cls(seed, width, height, flags, config_checksum)
+        for offset in range(cls.HEADER.size, len(data) - cls.RUN.size + 1, cls.RUN.size):
+            mask, count = cls.RUN.unpack_from(data, offset)
+            replay.runs.append([mask, count])
+            replay.tick_count += count
+        return replay
+    
+    def save(self, filename):
+        """Write the recording to a file"""
+        try:
+            with open(filename, 'wb') as f:
+                f.write(self.to_bytes())
+            logging.info(f"Replay saved: {filename} ({self.tick_count} ticks, {len(self.runs)} runs, seed {self.seed})")
+        except Exception as e:
+            logging.error(f"Error saving replay: {e}")
+    
+    @classmethod
+    def load(cls, filename):
+        """Read a recording from a file"""
+        with open(filename, 'rb') as f:
+            return cls.from_bytes(f.read())
+
 class ScrollBar:
     def __init__(self, x, y, width, height, total_items, visible_items):
         self.rect = pg.Rect(x, y, width, height)
@@ -895,6 +1924,24 @@ class ScrollBar:
 
         return False
 
+    def get_draw_state(self):
+        """Everything that changes how the scrollbar looks"""
+        return (self.rect.topleft, self.thumb_y, self.thumb_height, self.dragging)
+    
+    def set_geometry(self, x, y, width, height):
+        """Move and resize the track, keeping the scroll position and drag state"""
+        self.rect.update(x, y, width, height)
+        self.update_thumb()
+    
+    def set_content(self, total_items, visible_items):
+        """Update the item counts, keeping the scroll position and drag state where possible"""
+        if total_items == self.total_items and visible_items == self.visible_items:
+            return
+        self.total_items = total_items
+        self.visible_items = visible_items
+        self.scroll_position = max(0, min(self.scroll_position, total_items - visible_items))
+        self.update_thumb()
+    
     def set_scroll_position(self, position):
         """Set scroll position directly"""
         self.scroll_position = max(0, min(self.max_scroll, position))
@@ -961,20 +2008,24 @@ class Button:
         """Update hover state based on mouse position"""
         self.is_hovered = self.rect.collidepoint(mouse_pos)
     
+    def set_rect(self, x, y, width, height):
+        """Move and resize the button, used when the screen layout changes"""
+        self.rect.update(x, y, width, height)
+    
+    def get_draw_state(self):
+        """Everything that changes how the button looks"""
+        return (self.rect.topleft, self.is_hovered)
+    
     def draw(self, surface):
         # Try to use images if available
         if (self.image_manager and 
             not self.image_manager.use_fallbacks()):
             
-            # Get appropriate button image
-            if self.is_hovered:
-                button_img = self.image_manager.get_image('button_hover')
-            else:
-                button_img = self.image_manager.get_image('button_normal')
+            # Get appropriate button image, scaled to button size
+            button_key = 'button_hover' if self.is_hovered else 'button_normal'
+            scaled_img = self.image_manager.get_scaled_image(button_key, self.rect.size)
             
-            if button_img:
-                # Scale image to button size
-                scaled_img = pg.transform.scale(button_img, (self.rect.width, self.rect.height))
+            if scaled_img:
                 surface.blit(scaled_img, self.rect.topleft)
             else:
                 # Fallback to drawn button
@@ -993,14 +2044,14 @@ class Button:
                            (self.rect.height - 10) / text_img.get_height())
                 new_width = int(text_img.get_width() * scale)
                 new_height = int(text_img.get_height() * scale)
-                scaled_text = pg.transform.scale(text_img, (new_width, new_height))
+                scaled_text = self.image_manager.get_scaled_image(self.text_key, (new_width, new_height))
                 text_rect = scaled_text.get_rect(center=self.rect.center)
                 surface.blit(scaled_text, text_rect)
                 return
         
         # Fallback to rendered text
         text_color = self.hover_color if self.is_hovered else self.color
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = text_cache.render(self.font, self.text, True, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
     
@@ -1010,10 +2061,144 @@ class Button:
         pg.draw.rect(surface, DARK_GRAY, self.rect)
         pg.draw.rect(surface, color, self.rect, 3)
 
+class TextCursor:
+    """Blinking text input cursor, timed by the clock so it can blink without the rest of the screen redrawing"""
+    
+    def __init__(self, blink_ms=500):
+        self.blink_ms = blink_ms
+        self.active = False
+        self.x = 0
+        self.y = 0
+        self.height = 0
+        self.width = 1
+        self.rect = pg.Rect(0, 0, 0, 0)  # Area the cursor line can cover
+    
+    def place(self, x, y, height, width):
+        """Move the cursor to the end of the text"""
+        self.x, self.y, self.height, self.width = x, y, height, width
+        self.rect.update(x - width, y - width, width * 2 + 1, height + width * 2 + 1)
+    
+    def is_visible(self):
+        return self.active and pg.time.get_ticks() // self.blink_ms % 2 == 0
+    
+    def get_draw_state(self):
+        """Everything that changes how the cursor looks"""
+        return (self.rect.topleft, self.is_visible())
+    
+    def draw(self, surface):
+        if self.is_visible():
+            pg.draw.line(surface, WHITE, (self.x, self.y), (self.x, self.y + self.height), self.width)
+
+class WidgetTree:
+    """The widgets of one game state, created once and laid out again only when the screen size changes"""
+    
+    def __init__(self, build, layout):
+        self.build = build  # () -> {name: widget}
+        self.layout = layout  # (widgets) -> {name: value} of positions the screen needs
+        self.widgets = None
+        self.metrics = None
+        self.needs_layout = True
+    
+    def get(self):
+        """Get the widgets and layout values, building or laying them out first if needed"""
+        if self.widgets is None:
+            self.widgets = self.build()
+            for widget in self.widgets.values():
+                if isinstance(widget, Button):
+                    widget.image_manager = image_manager
+        if self.needs_layout:
+            self.metrics = self.layout(self.widgets)
+            self.needs_layout = False
+        return self.widgets, self.metrics
+    
+    def invalidate_layout(self):
+        """Lay the widgets out again on next use, hover and scroll state are kept"""
+        self.needs_layout = True
+
+class DirtyRectRenderer:
+    """Draws static screens once into a cached layer, then redraws and pushes only the widgets that changed"""
+    
+    def __init__(self):
+        self.layer = None  # The screen without its widgets
+        self.content_key = None  # What the layer was composed from, see get_screen_content_key
+        self.result = None  # What the screen's draw function returned when the layer was composed
+        self.widgets = ()
+        self.widget_states = []
+        self.composing = False
+        self.presented = False  # The current frame was already pushed to the display
+        self.last_change = 0
+        self.full_redraws = 0
+        self.partial_redraws = 0
+    
+    def invalidate(self):
+        """Compose the layer again on the next frame"""
+        self.content_key = None
+    
+    def render(self, surface, draw_screen, content_key):
+        """Draw a static screen, recomposing only when content_key changes, and return what draw_screen returns"""
+        if content_key != self.content_key:
+            # draw_widgets hands the widgets over instead of drawing them while composing
+            self.widgets = ()
+            self.composing = True
+            try:
+                self.result = draw_screen()
+            finally:
+                self.composing = False
+            
+            if self.layer is None or self.layer.get_size() != surface.get_size():
+                self.layer = surface.copy()
+            else:
+                self.layer.blit(surface, (0, 0))
+            
+            for widget in self.widgets:
+                widget.draw(surface)
+            self.widget_states = [widget.get_draw_state() for widget in self.widgets]
+            self.content_key = content_key
+            
+            pg.display.flip()
+            self.full_redraws += 1
+            self.last_change = pg.time.get_ticks()
+        else:
+            mouse_pos = pg.mouse.get_pos()
+            dirty_rects = []
+            for i, widget in enumerate(self.widgets):
+                if isinstance(widget, Button):
+                    widget.update_hover(mouse_pos)
+                state = widget.get_draw_state()
+                if state != self.widget_states[i]:
+                    # Restore what was under the widget, then draw it in its new state
+                    self.widget_states[i] = state
+                    surface.blit(self.layer, widget.rect, widget.rect)
+                    widget.draw(surface)
+                    dirty_rects.append(widget.rect)
+            
+            if dirty_rects:
+                pg.display.update(dirty_rects)
+                self.partial_redraws += 1
+                self.last_change = pg.time.get_ticks()
+        
+        self.presented = True
+        return self.result
+    
+    def is_idle(self):
+        """True once nothing has changed on screen for a while"""
+        return pg.time.get_ticks() - self.last_change >= DIRTY_RECT_IDLE_MS
+
 # GAME OBJECTS
 
 class Bottle:
+    # Slots instead of a per-bottle __dict__, there can be hundreds of live bottles
+    __slots__ = ('start_x', 'start_y', 'x', 'y', 'hand', 'is_preview_transition', 'bottle_type_id', 'config',
+                 'bottle_type', 'name', 'target_x', 'target_y', 'target_z', 'z', 'z_speed', 'curve_strength',
+                 'curve_direction', 'curve_peak_z', 'total_frames', 'dx', 'dy', 'base_width', 'base_height',
+                 'rotation', 'rotation_speed', 'image_manager', 'active', 'hit_player', 'scored', 'frame_count',
+                 'prev_x', 'prev_y', 'prev_z')
+    
     def __init__(self, start_x, start_y, target_x, target_y, bottle_type_id=1, hand="right", is_preview_transition=False):
+        self.reset(start_x, start_y, target_x, target_y, bottle_type_id, hand, is_preview_transition)
+    
+    def reset(self, start_x, start_y, target_x, target_y, bottle_type_id=1, hand="right", is_preview_transition=False):
+        """Initialize the bottle for a new throw, also used when it is reused from a pool"""
         # Get current scaling factors
         scale_x = SCREEN_WIDTH / BASE_WIDTH
         scale_y = SCREEN_HEIGHT / BASE_HEIGHT
@@ -1055,9 +2240,9 @@ class Bottle:
             self.z_speed = 0.008  # Faster movement for left hand
             # Use bottle-specific curve values
             if self.config['max_curve'] > 0:
-                self.curve_strength = random.uniform(self.config['min_curve'], self.config['max_curve'])
-                self.curve_direction = random.choice([-1, 1])  # Left or right curve
-                self.curve_peak_z = random.uniform(0.4, 0.8)  # Where the curve peaks
+                self.curve_strength = game_rng.uniform(self.config['min_curve'], self.config['max_curve'])
+                self.curve_direction = game_rng.choice([-1, 1])  # Left or right curve
+                self.curve_peak_z = game_rng.uniform(0.4, 0.8)  # Where the curve peaks
             else:
                 self.curve_strength = 0
                 self.curve_direction = 0
@@ -1066,9 +2251,9 @@ class Bottle:
             self.z_speed = 0.01  # Faster speed for right hand
             # Right hand can also have curves now based on bottle config
             if self.config['max_curve'] > 0:
-                self.curve_strength = random.uniform(self.config['min_curve'], self.config['max_curve'])
-                self.curve_direction = random.choice([-1, 1])
-                self.curve_peak_z = random.uniform(0.4, 0.8)
+                self.curve_strength = game_rng.uniform(self.config['min_curve'], self.config['max_curve'])
+                self.curve_direction = game_rng.choice([-1, 1])
+                self.curve_peak_z = game_rng.uniform(0.4, 0.8)
             else:
                 self.curve_strength = 0
                 self.curve_direction = 0
@@ -1088,11 +2273,7 @@ class Bottle:
         self.base_width = max(1, int(self.config['width'] * scale_x))
         self.base_height = max(1, int(self.config['height'] * scale_y))
         self.rotation = 0
-        self.rotation_speed = random.uniform(7, 10)
-        
-        # Create bottle surface with bottle-specific color
-        self.original_image = pg.Surface((self.base_width, self.base_height), pg.SRCALPHA)
-        self.original_image.fill(self.config['color'])
+        self.rotation_speed = game_rng.uniform(7, 10)
         
         # Image manager reference (will be set globally)
         self.image_manager = None
@@ -1101,12 +2282,18 @@ class Bottle:
         self.hit_player = False  # Track if bottle hit player
         self.scored = False  # Track if bottle has been scored for dodging
         self.frame_count = 0  # Track frames for smooth movement
+        
+        # Position at the previous simulation step, for interpolated drawing
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_z = self.z
 
     def update(self):
         """Update bottle position and state"""
         if not self.active:
             return True
         
+        self.prev_x, self.prev_y, self.prev_z = self.x, self.y, self.z
         self.frame_count += 1
         
         # Move along z-axis (simulating depth) - faster movement
@@ -1144,39 +2331,44 @@ class Bottle:
             
         return False
 
-    def draw(self, surface):
-        """Draw bottle with perspective scaling"""
-        if not self.active or self.z <= 0:
+    def draw(self, surface, alpha=1.0):
+        """Draw bottle with perspective scaling, interpolated between the last two simulation steps"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        z = self.prev_z + (self.z - self.prev_z) * alpha
+        
+        if not self.active or z <= 0:
             return
         
         # Calculate size based on z-position - scaled dynamically with better scaling
         # Make bottles 50% smaller by reducing the scaling factor
-        scale_factor = (self.z ** 1.2) * (4 * min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT))  # Reduced from 8 to 4 (50% smaller)
+        scale_factor = (z ** 1.2) * (4 * min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT))  # Reduced from 8 to 4 (50% smaller)
         scale_factor = max(scale_factor, 0.1)
         
         current_width = max(int(self.base_width * scale_factor), 1)
         current_height = max(int(self.base_height * scale_factor), 1)
         
-        # Try to use bottle image if available
-        if (self.image_manager and 
-            not self.image_manager.use_fallbacks()):
+        # Look up the scaled and rotated sprite in the shared cache when possible
+        if self.image_manager:
+            bottle_img = None
+            if not self.image_manager.use_fallbacks():
+                bottle_img = self.image_manager.get_image(f'bottle_{self.bottle_type_id}')
             
-            bottle_img = self.image_manager.get_image(f'bottle_{self.bottle_type_id}')
             if bottle_img:
-                # Scale and rotate the bottle image
-                scaled_image = pg.transform.scale(bottle_img, (current_width, current_height))
-                rotated_image = pg.transform.rotate(scaled_image, self.rotation)
+                rotated_image = self.image_manager.get_rotated_sprite(
+                    f'bottle_{self.bottle_type_id}', bottle_img, (current_width, current_height), self.rotation)
             else:
                 # Fallback to colored rectangle
-                scaled_image = pg.transform.scale(self.original_image, (current_width, current_height))
-                rotated_image = pg.transform.rotate(scaled_image, self.rotation)
+                rotated_image = self.image_manager.get_rotated_sprite(
+                    f'bottle_{self.bottle_type_id}_fallback', tuple(self.config['color']), (current_width, current_height), self.rotation)
         else:
-            # Use fallback colored rectangle
-            scaled_image = pg.transform.scale(self.original_image, (current_width, current_height))
+            # Use fallback colored rectangle, shared by all bottles of the same size and color
+            fallback_image = get_bottle_fallback_surface(int(self.base_width), int(self.base_height), self.config['color'])
+            scaled_image = pg.transform.scale(fallback_image, (current_width, current_height))
             rotated_image = pg.transform.rotate(scaled_image, self.rotation)
         
         # Position the bottle
-        rect = rotated_image.get_rect(center=(int(self.x), int(self.y)))
+        rect = rotated_image.get_rect(center=(int(x), int(y)))
         
         # Only draw if on screen and bottle is visible
         if (rect.right > 0 and rect.left < SCREEN_WIDTH and 
@@ -1258,15 +2450,290 @@ class Bottle:
         """Create visual effect when bottle impacts"""
         special_effect = self.config.get('special_effect')
         if special_effect in ['shatter', 'explosion']:
-            effect = VisualEffect(self.x, self.y, special_effect, self.image_manager)
+            effect = effect_pool.acquire(self.x, self.y, special_effect, self.image_manager)
             return effect
         return None
 
+class BottleEngine:
+    """Struct-of-arrays store that advances, curves and culls all live bottles in batched NumPy operations"""
+    
+    FIELDS = ('x', 'y', 'z', 'z_speed', 'dx', 'dy', 'target_z', 'curve_strength', 'curve_direction',
+              'curve_peak_z', 'rotation', 'rotation_speed', 'base_width', 'base_height', 'frame_count',
+              'is_air', 'is_ground', 'prev_x', 'prev_y', 'prev_z')
+    
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        
+        # EngineBottle views in slot order, shared with the game loop's bottle list
+        self.bottles = []
+    
+    def allocate(self, bottle):
+        """Reserve the next slot for a bottle, growing the arrays if needed"""
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for name in self.FIELDS:
+                array = np.zeros(self.capacity)
+                array[:self.count] = getattr(self, name)[:self.count]
+                setattr(self, name, array)
+        
+        slot = self.count
+        for name in self.FIELDS:
+            getattr(self, name)[slot] = 0.0
+        self.count += 1
+        self.bottles.append(bottle)
+        return slot
+    
+    def update_all(self):
+        """Advance every live bottle by one frame, same as Bottle.update, returning a list of finished flags"""
+        n = self.count
+        if n == 0:
+            return []
+        
+        x, y, z = self.x[:n], self.y[:n], self.z[:n]
+        target_z = self.target_z[:n]
+        curve_strength = self.curve_strength[:n]
+        curve_peak_z = self.curve_peak_z[:n]
+        
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        self.prev_z[:n] = z
+        self.frame_count[:n] += 1
+        
+        # Move along z-axis (simulating depth)
+        z += self.z_speed[:n] * 3
+        
+        # Curved trajectory using a sine wave peaking at curve_peak_z
+        progress = z / target_z
+        has_peak = curve_peak_z > 0
+        curve_progress = np.where(has_peak, np.minimum(1.0, progress / np.where(has_peak, curve_peak_z, 1.0)), progress)
+        curve_offset_x = np.sin(curve_progress * math.pi) * curve_strength * self.curve_direction[:n] * SCREEN_WIDTH * 0.1
+        curve_offset_x[(curve_strength <= 0) | (progress > 1.0)] = 0.0
+        
+        x += self.dx[:n] + (curve_offset_x * 0.05)
+        y += self.dy[:n]
+        
+        self.rotation[:n] = (self.rotation[:n] + self.rotation_speed[:n]) % 360
+        
+        # Finished when past the target z or completely off-screen
+        scale_factor = np.maximum((z ** 1.2) * (4 * min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT)), 0.1)
+        max_size = np.maximum(self.base_width[:n], self.base_height[:n]) * scale_factor
+        
+        finished = ((z >= target_z + 0.05) |
+                    (x + max_size < -100) | (x - max_size > SCREEN_WIDTH + 100) |
+                    (y + max_size < -100) | (y - max_size > SCREEN_HEIGHT + 100))
+        return finished.tolist()
+    
+    def detect_collisions(self, player_rect, player_is_jumping, player_center, close_call_distance):
+        """Test every live bottle against the player at once, same rules as Bottle, returning hit and close-call index sets"""
+        n = self.count
+        if n == 0:
+            return set(), set()
+        
+        x, y, z = self.x[:n], self.y[:n], self.z[:n]
+        is_air = self.is_air[:n] > 0
+        is_ground = self.is_ground[:n] > 0
+        
+        # Type mismatches rule out both hits and close calls
+        if player_is_jumping:
+            mismatched, matched = is_ground, is_air
+        else:
+            mismatched, matched = is_air, is_ground
+        
+        dx = x - player_center[0]
+        dy = y - player_center[1]
+        close = ~mismatched & (np.sqrt(dx * dx + dy * dy) <= close_call_distance)
+        
+        # Hitboxes use the same integer truncation as Bottle.get_collision_rect
+        in_zone = matched & (z >= 1.4) & (z <= 1.8)
+        scale_factor = np.maximum((z ** 1.2) * (4 * min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT)), 0.1)
+        hitbox_width = np.maximum(np.floor(np.maximum(np.floor(self.base_width[:n] * scale_factor), 1) * 0.8), 1)
+        hitbox_height = np.maximum(np.floor(np.maximum(np.floor(self.base_height[:n] * scale_factor), 1) * 0.8), 1)
+        left = np.trunc(x - hitbox_width // 2)
+        top = np.trunc(y - hitbox_height // 2)
+        
+        hit = (in_zone &
+               (left < player_rect.right) & (player_rect.left < left + hitbox_width) &
+               (top < player_rect.bottom) & (player_rect.top < top + hitbox_height))
+        
+        return set(np.flatnonzero(hit).tolist()), set(np.flatnonzero(close).tolist())
+    
+    def remove(self, indices):
+        """Remove bottles at the given slots and compact the remaining ones, keeping their order"""
+        if not indices:
+            return
+        
+        keep = np.ones(self.count, dtype=bool)
+        keep[list(indices)] = False
+        remaining = int(keep.sum())
+        
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:remaining] = array[:self.count][keep]
+        
+        # Update the list in place, the game loop holds a reference to it
+        self.bottles[:] = [bottle for bottle, kept in zip(self.bottles, keep.tolist()) if kept]
+        for slot, bottle in enumerate(self.bottles):
+            bottle.slot = slot
+        self.count = remaining
+    
+    def clear(self):
+        """Remove all bottles"""
+        self.bottles.clear()
+        self.count = 0
+
+def engine_field(name):
+    """Property that reads and writes one of a BottleEngine's arrays at the bottle's slot"""
+    def get_value(self):
+        return getattr(self.engine, name)[self.slot]
+    
+    def set_value(self, value):
+        getattr(self.engine, name)[self.slot] = value
+    
+    return property(get_value, set_value)
+
+class EngineBottle(Bottle):
+    """Bottle whose movement state lives in a BottleEngine, kept as a view for drawing and scoring"""
+    
+    __slots__ = ('engine', 'slot')
+    
+    x = engine_field('x')
+    y = engine_field('y')
+    z = engine_field('z')
+    z_speed = engine_field('z_speed')
+    dx = engine_field('dx')
+    dy = engine_field('dy')
+    target_z = engine_field('target_z')
+    curve_strength = engine_field('curve_strength')
+    curve_direction = engine_field('curve_direction')
+    curve_peak_z = engine_field('curve_peak_z')
+    rotation = engine_field('rotation')
+    rotation_speed = engine_field('rotation_speed')
+    base_width = engine_field('base_width')
+    base_height = engine_field('base_height')
+    frame_count = engine_field('frame_count')
+    prev_x = engine_field('prev_x')
+    prev_y = engine_field('prev_y')
+    prev_z = engine_field('prev_z')
+    
+    def __init__(self, engine, *args, **kwargs):
+        self.reset(engine, *args, **kwargs)
+    
+    def reset(self, engine, *args, **kwargs):
+        """Take a new engine slot and initialize the bottle, also used when it is reused from a pool"""
+        # The slot must exist before Bottle.reset assigns the fields above
+        self.engine = engine
+        self.slot = engine.allocate(self)
+        super().reset(*args, **kwargs)
+        
+        # Behaviour flags for batched collision tests
+        self.engine.is_air[self.slot] = self.bottle_type == "air"
+        self.engine.is_ground[self.slot] = self.bottle_type == "ground"
+
 # UTILITY FUNCTIONS
 
-def set_image_urls(urls_dict):
-    """Set image URLs from external source"""
-    global IMAGE_URLS
+def spawn_bottle(start_x, start_y, target_x, target_y, bottle_type_id=1, hand="right", is_preview_transition=False):
+    """Create a bottle and add it to the live bottle list, using the vectorized engine when enabled"""
+    if bottle_engine:
+        # The engine appends the bottle to its list, which is the live bottle list
+        new_bottle = engine_bottle_pool.acquire(bottle_engine, start_x, start_y, target_x, target_y, bottle_type_id, hand, is_preview_transition)
+    else:
+        new_bottle = bottle_pool.acquire(start_x, start_y, target_x, target_y, bottle_type_id, hand, is_preview_transition)
+        bottles.append(new_bottle)
+    
+    new_bottle.image_manager = image_manager
+    return new_bottle
+
+def release_bottle(bottle):
+    """Return a bottle that left play to its pool"""
+    if isinstance(bottle, EngineBottle):
+        engine_bottle_pool.release(bottle)
+    else:
+        bottle_pool.release(bottle)
+
+def remove_bottles(indices):
+    """Remove the bottles at the given indices from play, keeping the order of the rest"""
+    if not indices:
+        return
+    
+    removed = [bottles[i] for i in indices]
+    if bottle_engine:
+        bottle_engine.remove(indices)
+    else:
+        # Compact in place, no new list per frame
+        write = 0
+        for read, bottle in enumerate(bottles):
+            if read not in indices:
+                bottles[write] = bottle
+                write += 1
+        del bottles[write:]
+    
+    for bottle in removed:
+        release_bottle(bottle)
+
+def update_pooled_objects(items, pool):
+    """Update live objects in place, swap-removing finished ones and returning them to their pool"""
+    i = 0
+    while i < len(items):
+        item = items[i]
+        if item.update():
+            # Order doesn't matter here, so move the last object into the gap instead of shifting
+            items[i] = items[-1]
+            items.pop()
+            pool.release(item)
+        else:
+            i += 1
+
+def get_pool_stats():
+    """Get hit-rate counters for all object pools"""
+    return {
+        'bottles': bottle_pool.get_stats(),
+        'engine_bottles': engine_bottle_pool.get_stats(),
+        'score_popups': popup_pool.get_stats(),
+        'visual_effects': effect_pool.get_stats()
+    }
+
+def detect_bottle_collisions(player_x, player_y, player_width, player_height, player_is_jumping, finished):
+    """Test all live bottles against the player in one pass, returning hit and close-call index sets.
+    Close calls only matter for bottles that finished this tick, so only those are checked"""
+    player_rect = pg.Rect(int(player_x), int(player_y), player_width, player_height)
+    
+    if bottle_engine:
+        player_center = (player_x + player_width // 2, player_y + player_height // 2)
+        return bottle_engine.detect_collisions(player_rect, player_is_jumping, player_center, CLOSE_CALL_DISTANCE)
+    
+    # Only bottles in the player's depth zone have a hitbox
+    in_zone = [i for i, bottle in enumerate(bottles) if bottle.is_in_player_collision_zone(player_is_jumping)]
+    collision_rects = [bottles[i].get_collision_rect(player_is_jumping) for i in in_zone]
+    hits = {in_zone[j] for j in player_rect.collidelistall(collision_rects)}
+    
+    close = {i for i, bottle in enumerate(bottles)
+             if finished[i] and bottle.is_close_call(player_x, player_y, player_width, player_height, player_is_jumping)}
+    return hits, close
+
+def seed_game(seed=None):
+    """Seed the game RNG, picking a random seed if none is given, and return the seed"""
+    if seed is None:
+        seed = random.getrandbits(32)
+    game_rng.seed(seed)
+    return seed
+
+def start_game_clock():
+    """Restart the simulation clock at zero so spawn timing is the same in every game"""
+    global start_time, sim_time, last_bottle_time, last_left_bottle_time
+    start_time = sim_time = 0.0
+    last_bottle_time = last_left_bottle_time = sim_time
+
+def start_replay_recording(seed):
+    """Create a recorder for a game that starts now with the given seed"""
+    flags = ReplayRecorder.FLAG_VECTORIZED if bottle_engine else 0
+    return ReplayRecorder(seed, SCREEN_WIDTH, SCREEN_HEIGHT, flags, bottle_config.get_checksum())
+
+def set_image_urls(urls_dict):
+    """Set image URLs from external source"""
+    global IMAGE_URLS
     
     # Update single images
     single_keys = ['background_menu', 'background_game', 'background_settings', 
@@ -1308,6 +2775,16 @@ def create_fallback_surface(width, height, color, shape='rect'):
     
     return surface
 
+def get_bottle_fallback_surface(width, height, color):
+    """Get the plain colored bottle surface for a size and color, shared instead of created per bottle"""
+    key = (width, height, tuple(color))
+    surface = bottle_fallback_surfaces.get(key)
+    if surface is None:
+        surface = pg.Surface((width, height), pg.SRCALPHA)
+        surface.fill(color)
+        bottle_fallback_surfaces[key] = surface
+    return surface
+
 def safe_init():
     """Safely initialize pygame with error handling"""
     try:
@@ -1318,11 +2795,20 @@ def safe_init():
         logging.error(f"Failed to initialize pygame: {e}")
         return False
 
+def set_display_mode(size, flags):
+    """Create or recreate the display surface, counted because every switch invalidates it and can hitch a frame"""
+    global display_mode_switches
+    
+    surface = pg.display.set_mode(size, flags)
+    display_mode_switches += 1
+    logging.info(f"Display mode switch {display_mode_switches}: {surface.get_width()}x{surface.get_height()}")
+    return surface
+
 def create_display(width, height, caption):
     """Safely create display with error handling"""
     try:
         # Create window as resizable from the start to enable maximize button
-        screen = pg.display.set_mode((width, height), pg.SCALED | pg.NOFRAME)
+        screen = set_display_mode((width, height), pg.SCALED | pg.NOFRAME)
         pg.display.set_caption(caption)
         logging.info(f"Display created: {width}x{height} (resizable)")
         return screen
@@ -1349,12 +2835,12 @@ def toggle_fullscreen():
     try:
         if is_fullscreen:
             # Switch to windowed mode - preserve resizable state
-            screen = pg.display.set_mode((BASE_WIDTH, BASE_HEIGHT), pg.SCALED | pg.NOFRAME)
+            screen = set_display_mode((BASE_WIDTH, BASE_HEIGHT), pg.SCALED | pg.NOFRAME)
             is_fullscreen = False
             logging.info("Switched to windowed mode")
         else:
             # Switch to fullscreen mode
-            screen = pg.display.set_mode((0, 0), pg.FULLSCREEN)
+            screen = set_display_mode((0, 0), pg.FULLSCREEN)
             is_fullscreen = True
             logging.info("Switched to fullscreen mode")
         
@@ -1374,29 +2860,29 @@ def toggle_fullscreen():
         return False
 
 def restore_window_state():
-    """Restore window to a proper state if needed"""
-    global screen, SCREEN_WIDTH, SCREEN_HEIGHT
+    """Make sure the display surface exists and matches the tracked screen size, without recreating it needlessly"""
+    global screen
     
     try:
-        # Get current display info
-        info = pg.display.Info()
-        current_w = info.current_w
-        current_h = info.current_h
-        
-        # Only restore if there's a significant mismatch or if we're not in fullscreen
-        # and the window should be resizable but isn't
-        if not is_fullscreen:
-            # In windowed mode, ensure we have the resizable flag
-            if current_w != SCREEN_WIDTH or current_h != SCREEN_HEIGHT:
-                # Recreate the window with proper dimensions and resizable flag
-                screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SCALED | pg.NOFRAME)
-                logging.info(f"Window state restored: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-        else:
-            # In fullscreen mode, ensure we're actually fullscreen
-            if current_w != SCREEN_WIDTH or current_h != SCREEN_HEIGHT:
-                screen = pg.display.set_mode((0, 0), pg.FULLSCREEN)
-                logging.info("Fullscreen state restored")
-                
+        # A minimized window can report a bogus size, wait for it to be restored
+        if window_minimized:
+            return True
+        
+        surface = pg.display.get_surface()
+        
+        if surface is None:
+            # The display is gone, this is the only case that needs a new one
+            if is_fullscreen:
+                screen = set_display_mode((0, 0), pg.FULLSCREEN)
+            else:
+                screen = set_display_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SCALED | pg.NOFRAME)
+            update_screen_dimensions(screen.get_width(), screen.get_height())
+            logging.info(f"Display restored: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        elif surface.get_size() != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            # The window changed size without an event we saw, follow it rather than forcing the old size back
+            screen = surface
+            update_screen_dimensions(surface.get_width(), surface.get_height())
+        
         return True
         
     except Exception as e:
@@ -1417,6 +2903,16 @@ def update_screen_dimensions(width, height):
     # Update scaled values
     get_scaled_values()
     
+    # Re-derive display sized images for the new resolution
+    if image_manager:
+        image_manager.clear_scaled_images()
+        image_manager.refit_images()
+    
+    # Screen widgets are only repositioned when the size changes
+    for tree in widget_trees.values():
+        tree.invalidate_layout()
+    dirty_renderer.invalidate()
+    
     logging.info(f"Screen dimensions updated to {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
 
 def get_scaled_values():
@@ -1426,6 +2922,7 @@ def get_scaled_values():
     
     scale_x = SCREEN_WIDTH / BASE_WIDTH
     scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    old_sizes = (player_width, player_height, drunk_width, drunk_height)
     
     # Player dimensions - scaled
     player_width = max(60, int(120 * scale_x))
@@ -1437,6 +2934,10 @@ def get_scaled_values():
     drunk_height = max(120, int(240 * scale_y))
     drunk_y = max(100, int(200 * scale_y))
     
+    # Pre-scaled character frames are only rebuilt when the sizes actually change
+    if image_manager and (player_width, player_height, drunk_width, drunk_height) != old_sizes:
+        image_manager.clear_character_frames()
+    
     # Physics - scaled to maintain consistent gameplay feel
     player_speed = max(3, int(5 * scale_x))
     jump_power = max(-16, int(-12 * scale_y / BASE_HEIGHT * 600))  # Negative because up is negative
@@ -1466,13 +2967,12 @@ def add_score_popup(x, y, points, is_close_call=False, combo_mult=1.0, bottle_na
         text = f"{bottle_name} +{points}"
         color = GREEN
     
-    popup = ScorePopup(x, y, text, color, font_small)
+    popup = popup_pool.acquire(x, y, text, color, font_small)
     score_popups.append(popup)
 
 def update_score_popups():
     """Update all score popups and remove finished ones"""
-    global score_popups
-    score_popups = [popup for popup in score_popups if not popup.update()]
+    update_pooled_objects(score_popups, popup_pool)
 
 def draw_score_popups(surface):
     """Draw all active score popups"""
@@ -1481,25 +2981,40 @@ def draw_score_popups(surface):
 
 def reset_game():
     """Reset all game variables for a new game"""
-    global player_x, player_y, vel_y, is_on_ground, drunk_x, lives, start_time, last_bottle_time, bottles
+    global player_x, player_y, vel_y, is_on_ground, drunk_x, lives, start_time, bottles
     global score, bottles_dodged, close_calls, combo_multiplier, score_popups
-    global bottle_spawn_time, left_hand_spawn_time, last_left_bottle_time
+    global bottle_spawn_time, left_hand_spawn_time
     global visual_effects, player_jumping, drunk_current_animation
     global left_hand_preview, right_hand_preview, left_hand_preview_time, right_hand_preview_time
     global player_facing_right, player_last_direction
+    global prev_player_x, prev_player_y
     
     # Recalculate scaled values in case screen size changed
     get_scaled_values()
     
     player_x = SCREEN_WIDTH // 2 - player_width // 2
     player_y = player_base_y
+    prev_player_x = player_x
+    prev_player_y = player_y
     vel_y = 0
     is_on_ground = False
     drunk_x = SCREEN_WIDTH // 2 - drunk_width // 2  # Drunk guy stays centered
     lives = 9
-    last_bottle_time = pg.time.get_ticks()
-    last_left_bottle_time = pg.time.get_ticks()
-    bottles = []
+    start_game_clock()
+    
+    # Return everything still live to the pools
+    for bottle in bottles:
+        release_bottle(bottle)
+    for popup in score_popups:
+        popup_pool.release(popup)
+    for effect in visual_effects:
+        effect_pool.release(effect)
+    
+    if bottle_engine:
+        bottle_engine.clear()
+        bottles = bottle_engine.bottles
+    else:
+        bottles = []
     
     # Reset hand preview system
     left_hand_preview = None
@@ -1545,12 +3060,10 @@ def calculate_final_score():
 def draw_background(surface, bg_type='menu'):
     """Draw background image or fallback"""
     bg_key = f'background_{bg_type}'
-    bg_img = image_manager.get_image(bg_key)
+    bg_img = image_manager.get_scaled_image(bg_key, (SCREEN_WIDTH, SCREEN_HEIGHT))
     
     if bg_img:
-        # Scale background to screen size
-        scaled_bg = pg.transform.scale(bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        surface.blit(scaled_bg, (0, 0))
+        surface.blit(bg_img, (0, 0))
     else:
         # Fallback to solid color
         if bg_type == 'menu':
@@ -1564,16 +3077,32 @@ def draw_background(surface, bg_type='menu'):
         else:
             surface.fill(BLACK)
 
+def draw_widgets(surface, widgets):
+    """Update hover states and draw a screen's buttons, scrollbars and cursors"""
+    mouse_pos = pg.mouse.get_pos()
+    for widget in widgets:
+        if isinstance(widget, Button):
+            widget.update_hover(mouse_pos)
+    
+    # The dirty rect renderer draws widgets over its cached layer itself
+    if dirty_renderer.composing:
+        dirty_renderer.widgets = widgets
+        return
+    
+    for widget in widgets:
+        widget.draw(surface)
+
 def draw_text_or_image(surface, text_key, fallback_text, font, color, pos, center=True):
     """Draw text image if available, otherwise render text"""
     text_img = image_manager.get_image(text_key)
     
     if text_img:
-        # Scale text image appropriately (scaled down by 15 times)
+        # Scale text image appropriately (scaled down by 15 times), relative to its original size
+        native_width, native_height = image_manager.get_native_size(text_key)
         scale = min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT) / 10
-        img_width = int(text_img.get_width() * scale * 0.8)  # Slightly smaller than full scale
-        img_height = int(text_img.get_height() * scale * 0.8)
-        scaled_img = pg.transform.scale(text_img, (img_width, img_height))
+        img_width = int(native_width * scale * 0.8)  # Slightly smaller than full scale
+        img_height = int(native_height * scale * 0.8)
+        scaled_img = image_manager.get_scaled_image(text_key, (img_width, img_height))
         
         if center:
             rect = scaled_img.get_rect(center=pos)
@@ -1584,7 +3113,7 @@ def draw_text_or_image(surface, text_key, fallback_text, font, color, pos, cente
         return rect
     else:
         # Fallback to rendered text
-        text_surface = font.render(fallback_text, True, color)
+        text_surface = text_cache.render(font, fallback_text, True, color)
         if center:
             rect = text_surface.get_rect(center=pos)
         else:
@@ -1622,12 +3151,11 @@ def draw_player_with_depth(surface, x, y, width, height, is_jumping, image_manag
     pg.draw.line(surface, shadow_color, (int(x), int(y)), (int(x + shadow_offset), int(y + shadow_offset)), line_width)
     pg.draw.line(surface, shadow_color, (int(x + width), int(y)), (int(x + width + shadow_offset), int(y + shadow_offset)), line_width)
 
-def update_player_animation_state():
+def update_player_animation_state(moving):
     """Update player animation state based on movement"""
     global player_moving, player_jumping, player_on_ground_last_frame
     
-    keys = pg.key.get_pressed()
-    player_moving = keys[pg.K_LEFT] or keys[pg.K_a] or keys[pg.K_RIGHT] or keys[pg.K_d]
+    player_moving = moving
     
     # Detect jump start
     if is_on_ground and not player_on_ground_last_frame:
@@ -1648,40 +3176,25 @@ def draw_animated_player(surface, x, y, width, height):
     global player_jumping, player_facing_right
     
     # Determine which animation to use
-    current_frame = None
-    
     if not is_on_ground:
-        # Jumping animation
-        jump_anim = image_manager.get_animation('player_jump')
-        if jump_anim:
-            current_frame = jump_anim.get_current_frame()
-            # Reset jumping flag when animation finishes
-            if jump_anim.is_finished():
-                player_jumping = False
-    
+        anim_key = 'player_jump'  # Jumping animation
     elif player_moving:
-        # Running animation
-        run_anim = image_manager.get_animation('player_run')
-        if run_anim:
-            current_frame = run_anim.get_current_frame()
-    
+        anim_key = 'player_run'  # Running animation
     else:
-        # Idle animation
-        idle_anim = image_manager.get_animation('player_idle')
-        if idle_anim:
-            current_frame = idle_anim.get_current_frame()
+        anim_key = 'player_idle'  # Idle animation
     
-    if current_frame:
-        # Scale the frame
-        scaled_frame = pg.transform.scale(current_frame, (width, height))
-        
-        # Apply depth effect when jumping
-        if not is_on_ground:
-            scaled_frame.set_alpha(180)
-        
-        # Flip the frame based on direction
-        scaled_frame = pg.transform.flip(scaled_frame, player_facing_right, False)
+    scaled_frame = None
+    anim = image_manager.get_animation(anim_key)
+    if anim:
+        # Reset jumping flag when animation finishes
+        if anim_key == 'player_jump' and anim.is_finished():
+            player_jumping = False
         
+        # Pre-scaled frame, flipped based on direction and translucent as a depth effect when jumping
+        scaled_frame = image_manager.get_character_frame(
+            anim_key, anim.get_frame_index(), (width, height), player_facing_right, not is_on_ground)
+    
+    if scaled_frame:
         rect = scaled_frame.get_rect(center=(int(x + width//2), int(y + height//2)))
         surface.blit(scaled_frame, rect.topleft)
     else:
@@ -1727,9 +3240,8 @@ def draw_animated_drunk(surface, x, y, width, height):
     idle_anim = image_manager.get_animation('drunk_idle')
     
     if idle_anim:
-        frame = idle_anim.get_current_frame()
-        if frame:
-            scaled_frame = pg.transform.scale(frame, (width, height))
+        scaled_frame = image_manager.get_character_frame('drunk_idle', idle_anim.get_frame_index(), (width, height))
+        if scaled_frame:
             rect = scaled_frame.get_rect(center=(int(x + width//2), int(y + height//2)))
             surface.blit(scaled_frame, rect.topleft)
         else:
@@ -1766,9 +3278,8 @@ def draw_hand_previews(surface, drunk_x, drunk_y, drunk_width, drunk_height):
         
         # Try to use bottle image if available
         if (image_manager and not image_manager.use_fallbacks()):
-            bottle_img = image_manager.get_image(f'bottle_{right_hand_preview["type_id"]}')
-            if bottle_img:
-                scaled_img = pg.transform.scale(bottle_img, (preview_size, preview_size))
+            scaled_img = image_manager.get_scaled_image(f'bottle_{right_hand_preview["type_id"]}', (preview_size, preview_size))
+            if scaled_img:
                 surface.blit(scaled_img, preview_rect.topleft)
             else:
                 pg.draw.rect(surface, right_hand_preview['color'], preview_rect)
@@ -1782,9 +3293,8 @@ def draw_hand_previews(surface, drunk_x, drunk_y, drunk_width, drunk_height):
         
         # Try to use bottle image if available
         if (image_manager and not image_manager.use_fallbacks()):
-            bottle_img = image_manager.get_image(f'bottle_{left_hand_preview["type_id"]}')
-            if bottle_img:
-                scaled_img = pg.transform.scale(bottle_img, (preview_size, preview_size))
+            scaled_img = image_manager.get_scaled_image(f'bottle_{left_hand_preview["type_id"]}', (preview_size, preview_size))
+            if scaled_img:
                 surface.blit(scaled_img, preview_rect.topleft)
             else:
                 pg.draw.rect(surface, left_hand_preview['color'], preview_rect)
@@ -1798,29 +3308,29 @@ def show_loading_screen():
     screen.fill((0, 0, 0))
     
     # Try to use background image
-    bg_img = image_manager.get_image('background_menu')
+    bg_img = image_manager.get_scaled_image('background_menu', (SCREEN_WIDTH, SCREEN_HEIGHT))
     if bg_img:
-        scaled_bg = pg.transform.scale(bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(scaled_bg, (0, 0))
+        screen.blit(bg_img, (0, 0))
     
     # Title
     title_img = image_manager.get_image('text_title')
     if title_img:
-        # Scale title image to appropriate size (scaled down by 15 times)
+        # Scale title image to appropriate size (scaled down by 15 times), relative to its original size
+        native_width, native_height = image_manager.get_native_size('text_title')
         scale = min(SCREEN_WIDTH / BASE_WIDTH, SCREEN_HEIGHT / BASE_HEIGHT) / 10
-        title_width = int(title_img.get_width() * scale)
-        title_height = int(title_img.get_height() * scale)
-        scaled_title = pg.transform.scale(title_img, (title_width, title_height))
+        title_width = int(native_width * scale)
+        title_height = int(native_height * scale)
+        scaled_title = image_manager.get_scaled_image('text_title', (title_width, title_height))
         title_rect = scaled_title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         screen.blit(scaled_title, title_rect)
     else:
         # Fallback text
-        title_text = font_large.render("BOTTLE OPS", True, (255, 255, 255))
+        title_text = text_cache.render(font_large, "BOTTLE OPS", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         screen.blit(title_text, title_rect)
     
     # Loading text
-    loading_text = font_medium.render("Loading assets...", True, (0, 100, 255))
+    loading_text = text_cache.render(font_medium, "Loading assets...", True, (0, 100, 255))
     loading_rect = loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
     screen.blit(loading_text, loading_rect)
     
@@ -1845,27 +3355,34 @@ def show_loading_screen():
         
         # Show percentage text
         percentage_text = image_manager.get_loading_percentage()
-        progress_text = font_small.render(f"Loading... {percentage_text}", True, (128, 128, 128))
+        progress_text = text_cache.render(font_small, f"Loading... {percentage_text}", True, (128, 128, 128))
         
         # Show spacebar skip option
-        skip_text = font_small.render("Press ENTER to skip loading", True, (255, 165, 0))  # Orange color
+        skip_text = text_cache.render(font_small, "Press ENTER to skip loading", True, (255, 165, 0))  # Orange color
         skip_rect = skip_text.get_rect(center=(SCREEN_WIDTH // 2, progress_bar_y + progress_bar_height + 60))
         screen.blit(skip_text, skip_rect)
     else:
         # Show full progress bar when done
         pg.draw.rect(screen, (0, 255, 100), (progress_bar_x, progress_bar_y, progress_bar_width, progress_bar_height))
-        progress_text = font_small.render("Press any key to continue", True, (0, 255, 100))
+        progress_text = text_cache.render(font_small, "Press any key to continue", True, (0, 255, 100))
     
     progress_rect = progress_text.get_rect(center=(SCREEN_WIDTH // 2, progress_bar_y + progress_bar_height + 30))
     screen.blit(progress_text, progress_rect)
     
     pg.display.flip()
 
-def show_menu():
-    """Display the main menu with enhanced visuals"""
-    draw_background(screen, 'menu')
-    
-    # Buttons - dynamically scaled
+def build_menu_widgets():
+    """Create the main menu buttons"""
+    return {
+        'play': Button(0, 0, 0, 0, "PLAY", font_medium, hover_color=GREEN, text_key='text_play'),
+        'settings': Button(0, 0, 0, 0, "SETTINGS", font_medium, text_key='text_settings'),
+        'bottle_config': Button(0, 0, 0, 0, "BOTTLE CONFIG", font_medium, hover_color=PURPLE, text_key='text_bottle_config'),
+        'leaderboard': Button(0, 0, 0, 0, "LEADERBOARD", font_medium, hover_color=YELLOW, text_key='text_leaderboard'),
+        'exit': Button(0, 0, 0, 0, "QUIT", font_medium, hover_color=RED, text_key='text_quit'),
+    }
+
+def layout_menu_widgets(widgets):
+    """Position the main menu buttons for the current screen size"""
     scale_x = SCREEN_WIDTH / BASE_WIDTH
     scale_y = SCREEN_HEIGHT / BASE_HEIGHT
     
@@ -1876,34 +3393,42 @@ def show_menu():
     spacing = max(40, int(50 * scale_y))
     start_y = SCREEN_HEIGHT // 2 - max(20, int(25 * scale_y))
     
+    for i, key in enumerate(('play', 'settings', 'bottle_config', 'leaderboard', 'exit')):
+        widgets[key].set_rect(button_x, start_y + spacing * i, button_width, button_height)
+    
+    return {}
+
+def show_menu():
+    """Display the main menu with enhanced visuals"""
+    draw_background(screen, 'menu')
+    
     # Title with image support - positioned just above play button with same spacing
     draw_text_or_image(screen, 'text_title', "BOTTLE OPS", font_large, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
     
-    play_button = Button(button_x, start_y, button_width, button_height, "PLAY", font_medium, hover_color=GREEN, text_key='text_play')
-    settings_button = Button(button_x, start_y + spacing, button_width, button_height, "SETTINGS", font_medium, text_key='text_settings')
-    bottle_config_button = Button(button_x, start_y + spacing * 2, button_width, button_height, "BOTTLE CONFIG", font_medium, hover_color=PURPLE, text_key='text_bottle_config')
-    leaderboard_button = Button(button_x, start_y + spacing * 3, button_width, button_height, "LEADERBOARD", font_medium, hover_color=YELLOW, text_key='text_leaderboard')
-    exit_button = Button(button_x, start_y + spacing * 4, button_width, button_height, "QUIT", font_medium, hover_color=RED, text_key='text_quit')
+    widgets, layout = widget_trees[MENU].get()
+    buttons = (widgets['play'], widgets['settings'], widgets['bottle_config'], widgets['leaderboard'], widgets['exit'])
+    draw_widgets(screen, buttons)
     
-    # Set image manager for all buttons
-    for button in [play_button, settings_button, bottle_config_button, leaderboard_button, exit_button]:
-        button.image_manager = image_manager
-    
-    # Update hover states for all buttons
-    mouse_pos = pg.mouse.get_pos()
-    play_button.update_hover(mouse_pos)
-    settings_button.update_hover(mouse_pos)
-    bottle_config_button.update_hover(mouse_pos)
-    leaderboard_button.update_hover(mouse_pos)
-    exit_button.update_hover(mouse_pos)
+    return buttons
+
+def build_settings_widgets():
+    """Create the settings menu buttons"""
+    return {'back': Button(0, 0, 0, 0, "BACK", font_medium, hover_color=ORANGE, text_key='text_back')}
+
+def layout_settings_widgets(widgets):
+    """Position the settings menu buttons for the current screen size"""
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
     
-    play_button.draw(screen)
-    settings_button.draw(screen)
-    bottle_config_button.draw(screen)
-    leaderboard_button.draw(screen)
-    exit_button.draw(screen)
+    # Back button - scaled proportionally
+    widgets['back'].set_rect(
+        SCREEN_WIDTH // 2 - max(80, int(100 * scale_x)), 
+        SCREEN_HEIGHT // 2 + max(20, int(30 * scale_y)), 
+        max(160, int(200 * scale_x)), 
+        max(30, int(40 * scale_y))
+    )
     
-    return play_button, settings_button, bottle_config_button, leaderboard_button, exit_button
+    return {}
 
 def show_settings():
     """Display the settings menu with enhanced visuals"""
@@ -1913,29 +3438,60 @@ def show_settings():
     draw_text_or_image(screen, None, "SETTINGS", font_large, WHITE, 
                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
     
-    # Dynamic scaling
+    widgets, layout = widget_trees[SETTINGS].get()
+    back_button = widgets['back']
+    draw_widgets(screen, (back_button,))
+    
+    return back_button
+
+def build_bottle_config_widgets():
+    """Create the bottle configuration list scrollbar and buttons"""
+    return {
+        'scrollbar': ScrollBar(0, 0, 0, 0, 15, 1),  # 15 bottle types
+        'back': Button(0, 0, 0, 0, "BACK", font_medium, hover_color=ORANGE, text_key='text_back'),
+    }
+
+def layout_bottle_config_widgets(widgets):
+    """Position the bottle configuration list and widgets for the current screen size"""
     scale_x = SCREEN_WIDTH / BASE_WIDTH
     scale_y = SCREEN_HEIGHT / BASE_HEIGHT
     
-    # Back button - scaled proportionally
-    back_button = Button(
-        SCREEN_WIDTH // 2 - max(80, int(100 * scale_x)), 
-        SCREEN_HEIGHT // 2 + max(20, int(30 * scale_y)), 
-        max(160, int(200 * scale_x)), 
-        max(30, int(40 * scale_y)), 
-        "BACK",
-        font_medium,
-        hover_color=ORANGE,
-        text_key='text_back'
-    )
+    # Define bottle list display area
+    list_start_y = int(SCREEN_HEIGHT * 0.2)
+    list_end_y = int(SCREEN_HEIGHT * 0.75)
+    list_area_height = list_end_y - list_start_y
+    line_spacing = max(25, int(35 * scale_y))
     
-    # Update hover states
-    mouse_pos = pg.mouse.get_pos()
-    back_button.update_hover(mouse_pos)
+    # Calculate visible bottles
+    max_visible_bottles = max(1, int(list_area_height // line_spacing))
     
-    back_button.image_manager = image_manager
-    back_button.draw(screen)    
-    return back_button
+    # Scrollbar for bottle list
+    scrollbar_width = max(15, int(20 * scale_x))
+    scrollbar_x = SCREEN_WIDTH - max(40, int(50 * scale_x))
+    widgets['scrollbar'].set_geometry(scrollbar_x, list_start_y, scrollbar_width, list_area_height)
+    widgets['scrollbar'].set_content(15, max_visible_bottles)
+    
+    # Back button
+    button_width = max(80, int(120 * scale_x))
+    button_height = max(30, int(40 * scale_y))
+    widgets['back'].set_rect(
+        SCREEN_WIDTH // 2 - button_width // 2,
+        SCREEN_HEIGHT - max(60, int(80 * scale_y)),
+        button_width,
+        button_height
+    )
+    
+    preview_size = max(8, int(12 * min(scale_x, scale_y)))
+    preview_x = max(20, int(30 * scale_x))
+    return {
+        'list_start_y': list_start_y,
+        'line_spacing': line_spacing,
+        'max_visible_bottles': max_visible_bottles,
+        'preview_size': preview_size,
+        'preview_x': preview_x,
+        'text_x': preview_x + preview_size + max(10, int(15 * scale_x)),
+        'instructions_y': list_end_y + max(20, int(30 * scale_y)),
+    }
 
 def show_bottle_config():
     """Display bottle configuration menu with scrollable list and enhanced visuals"""
@@ -1947,37 +3503,18 @@ def show_bottle_config():
     draw_text_or_image(screen, None, "BOTTLE CONFIGURATION", font_large, WHITE,
                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 8))
     
-    # Dynamic scaling
-    scale_x = SCREEN_WIDTH / BASE_WIDTH
-    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-    
-    # Define bottle list display area
-    list_start_y = int(SCREEN_HEIGHT * 0.2)
-    list_end_y = int(SCREEN_HEIGHT * 0.75)
-    list_area_height = list_end_y - list_start_y
-    line_spacing = max(25, int(35 * scale_y))
-    
-    # Calculate visible bottles
-    max_visible_bottles = max(1, int(list_area_height // line_spacing))
+    widgets, layout = widget_trees[BOTTLE_CONFIG].get()
+    list_start_y = layout['list_start_y']
+    line_spacing = layout['line_spacing']
+    max_visible_bottles = layout['max_visible_bottles']
+    preview_size = layout['preview_size']
     
     # Ensure bottle_config_scroll is initialized
     if bottle_config_scroll is None:
         bottle_config_scroll = 0
     
-    # Create scrollbar for bottle list
-    scrollbar_width = max(15, int(20 * scale_x))
-    scrollbar_x = SCREEN_WIDTH - max(40, int(50 * scale_x))
-    scrollbar_height = list_area_height
-    
-    # Always create a new scrollbar to avoid crashes
-    bottle_config_scrollbar = ScrollBar(
-        scrollbar_x,
-        list_start_y,
-        scrollbar_width,
-        scrollbar_height,
-        15,  # Total bottle types
-        max_visible_bottles
-    )
+    # The scrollbar is kept between frames so dragging carries over, only its position is synced
+    bottle_config_scrollbar = widgets['scrollbar']
     bottle_config_scrollbar.set_scroll_position(bottle_config_scroll)
     
     # Draw bottle list
@@ -1988,17 +3525,14 @@ def show_bottle_config():
         y_pos = list_start_y + i * line_spacing
         
         # Draw bottle preview (small colored rectangle or image)
-        preview_size = max(8, int(12 * min(scale_x, scale_y)))
-        preview_rect = pg.Rect(max(20, int(30 * scale_x)), y_pos, preview_size, preview_size)
+        preview_rect = pg.Rect(layout['preview_x'], y_pos, preview_size, preview_size)
         
         # Try to use bottle image if available
         if (image_manager and 
             not image_manager.use_fallbacks()):
             
-            bottle_img = image_manager.get_image(f'bottle_{bottle_id}')
-            if bottle_img:
-                # Scale image to preview size
-                scaled_img = pg.transform.scale(bottle_img, (preview_size, preview_size))
+            scaled_img = image_manager.get_scaled_image(f'bottle_{bottle_id}', (preview_size, preview_size))
+            if scaled_img:
                 screen.blit(scaled_img, preview_rect.topleft)
             else:
                 # Fallback to colored rectangle
@@ -2008,45 +3542,25 @@ def show_bottle_config():
             pg.draw.rect(screen, config['color'], preview_rect)
         
         # Draw bottle info
-        text_x = preview_rect.right + max(10, int(15 * scale_x))
         bottle_text = f"{bottle_id}. {config['name']} - Score: {config['score_gain']} - Min curve: {config['min_curve']} - Max curve: {config['max_curve']} - H{config['height']} W{config['width']}"
         
         # Highlight if it has curve properties
         color = WHITE
         
-        bottle_surface = font_small.render(bottle_text, True, color)
-        screen.blit(bottle_surface, (text_x, y_pos))
-    
-    # Draw scrollbar
-    if 15 > max_visible_bottles:
-        bottle_config_scrollbar.draw(screen)
+        bottle_surface = text_cache.render(font_small, bottle_text, True, color)
+        screen.blit(bottle_surface, (layout['text_x'], y_pos))
     
     # Instructions
-    inst_text = font_small.render("Click on a bottle to customize it", True, GRAY)
-    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, list_end_y + max(20, int(30 * scale_y))))
+    inst_text = text_cache.render(font_small, "Click on a bottle to customize it", True, GRAY)
+    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, layout['instructions_y']))
     screen.blit(inst_text, inst_rect)
     
-    # Back button
-    button_width = max(80, int(120 * scale_x))
-    button_height = max(30, int(40 * scale_y))
-    back_button = Button(
-        SCREEN_WIDTH // 2 - button_width // 2,
-        SCREEN_HEIGHT - max(60, int(80 * scale_y)),
-        button_width,
-        button_height,
-        "BACK",
-        font_medium,
-        hover_color=ORANGE,
-        text_key='text_back'
-    )
-    
-    # Set image manager for button
-    back_button.image_manager = image_manager
-    
-    # Update hover state
-    mouse_pos = pg.mouse.get_pos()
-    back_button.update_hover(mouse_pos)
-    back_button.draw(screen)
+    # Back button, and the scrollbar if the list doesn't fit
+    back_button = widgets['back']
+    if 15 > max_visible_bottles:
+        draw_widgets(screen, (back_button, bottle_config_scrollbar))
+    else:
+        draw_widgets(screen, (back_button,))
     
     return back_button, bottle_config_scrollbar, visible_bottles, list_start_y, line_spacing
 
@@ -2076,20 +3590,16 @@ def recalculate_scrollbar():
         max_visible_scores
     )
 
-def show_leaderboard():
-    """Display the leaderboard with visual scrollbar and enhanced visuals"""
-    global leaderboard_scroll, scrollbar
-    
-    draw_background(screen, 'leaderboard')
-    
-    # Title with image support
-    draw_text_or_image(screen, None, "LEADERBOARD", font_large, WHITE,
-                      (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 6))
-    
-    # Get all scores
-    all_scores = leaderboard.get_all_scores()
-    
-    # Dynamic scaling
+def build_leaderboard_widgets():
+    """Create the leaderboard scrollbar and buttons"""
+    return {
+        'scrollbar': ScrollBar(0, 0, 0, 0, 0, 1),
+        'clear': Button(0, 0, 0, 0, "CLEAR", font_medium, color=YELLOW, hover_color=RED, text_key= 'text_clear'),
+        'back': Button(0, 0, 0, 0, "BACK", font_medium, hover_color=ORANGE, text_key='text_back'),
+    }
+
+def layout_leaderboard_widgets(widgets):
+    """Position the leaderboard score box and widgets for the current screen size"""
     scale_x = SCREEN_WIDTH / BASE_WIDTH
     scale_y = SCREEN_HEIGHT / BASE_HEIGHT
     line_spacing = max(20, int(30 * scale_y))
@@ -2099,40 +3609,73 @@ def show_leaderboard():
     scores_end_y = int(SCREEN_HEIGHT * 0.8)    # End above buttons
     scores_area_height = scores_end_y - scores_start_y
 
-    # Draw outline around the scores area
+    # Outline around the scores area
     box_margin = max(8, int(10 * scale_y))  # Add some padding around the scores
     box_x = int(SCREEN_WIDTH * 0.3)
     box_width = SCREEN_WIDTH - 2 * box_x
     box_y = scores_start_y - box_margin - 20
     box_height = 40 + scores_area_height + 2 * box_margin
-
-    outline_rect = pg.Rect(box_x, box_y, box_width, box_height)
-    pg.draw.rect(screen, WHITE, outline_rect, max(2, int(3 * min(scale_x, scale_y))))
-    pg.draw.rect(screen, BLACK, outline_rect, 0)
     
     # Calculate how many scores can fit in the grey box
     available_height = box_height - 2 * box_margin
-    max_visible_scores = max(1, int(available_height // line_spacing))
+    
+    # Scrollbar beside the box
+    scrollbar_width = max(15, int(20 * scale_x))
+    scrollbar_x = box_x + box_width + max(5, int(8 * scale_x))
+    widgets['scrollbar'].set_geometry(scrollbar_x, box_y, scrollbar_width, box_height)
+    
+    # Buttons at bottom - scaled proportionally
+    button_width = max(80, int(120 * scale_x))
+    button_height = max(30, int(40 * scale_y))
+    button_spacing = max(100, int(140 * scale_x))
+    
+    # Center the buttons
+    total_button_width = button_width * 2 + button_spacing
+    start_x = (SCREEN_WIDTH - total_button_width) // 2
+    button_y = SCREEN_HEIGHT - max(45, int(60 * scale_y))
+    
+    widgets['clear'].set_rect(start_x, button_y, button_width, button_height)
+    widgets['back'].set_rect(start_x + button_width + button_spacing, button_y, button_width, button_height)
+    
+    return {
+        'line_spacing': line_spacing,
+        'box_margin': box_margin,
+        'outline_rect': pg.Rect(box_x, box_y, box_width, box_height),
+        'outline_width': max(2, int(3 * min(scale_x, scale_y))),
+        'max_visible_scores': max(1, int(available_height // line_spacing)),
+        'text_left_margin': box_x + max(15, int(20 * scale_x)),  # Left edge of box + padding
+    }
+
+def show_leaderboard():
+    """Display the leaderboard with visual scrollbar and enhanced visuals"""
+    global leaderboard_scroll, scrollbar
+    
+    draw_background(screen, 'leaderboard')
+    
+    # Title with image support
+    draw_text_or_image(screen, None, "LEADERBOARD", font_large, WHITE,
+                      (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 6))
+    
+    # Get all scores
+    all_scores = leaderboard.get_all_scores()
+    
+    widgets, layout = widget_trees[LEADERBOARD].get()
+    line_spacing = layout['line_spacing']
+    box_margin = layout['box_margin']
+    outline_rect = layout['outline_rect']
+    max_visible_scores = layout['max_visible_scores']
+
+    # Draw outline around the scores area
+    pg.draw.rect(screen, WHITE, outline_rect, layout['outline_width'])
+    pg.draw.rect(screen, BLACK, outline_rect, 0)
     
     # Ensure leaderboard_scroll is initialized
     if leaderboard_scroll is None:
         leaderboard_scroll = 0
     
-    # Create scrollbar
-    scrollbar_width = max(15, int(20 * scale_x))
-    scrollbar_x = box_x + box_width + max(5, int(8 * scale_x))
-    scrollbar_y = box_y
-    scrollbar_height = box_height
-    
-    # Always create a new scrollbar to avoid crashes
-    scrollbar = ScrollBar(
-        scrollbar_x,
-        scrollbar_y,
-        scrollbar_width,
-        scrollbar_height,
-        len(all_scores),
-        max_visible_scores
-    )
+    # The scrollbar is kept between frames so dragging carries over, the score count can change though
+    scrollbar = widgets['scrollbar']
+    scrollbar.set_content(len(all_scores), max_visible_scores)
     
     # Set scroll position
     scrollbar.set_scroll_position(leaderboard_scroll)
@@ -2140,9 +3683,6 @@ def show_leaderboard():
     # Display visible scores within the grey box bounds
     visible_scores = all_scores[leaderboard_scroll:leaderboard_scroll + max_visible_scores]
     
-    # Calculate left margin for text alignment (inside the grey box)
-    text_left_margin = box_x + max(15, int(20 * scale_x))  # Left edge of box + padding
-    
     for i, score_data in enumerate(visible_scores):
         username = score_data['username']
         score = score_data['score']
@@ -2163,147 +3703,127 @@ def show_leaderboard():
         else:
             color = WHITE
         
-        score_surface = font_small.render(rank_text, True, color)
+        score_surface = text_cache.render(font_small, rank_text, True, color)
         # Left-align the text within the grey box
         score_rect = score_surface.get_rect()
-        score_rect.x = text_left_margin
-        score_rect.y = box_y + box_margin + i * line_spacing  # Position within grey box bounds
+        score_rect.x = layout['text_left_margin']
+        score_rect.y = outline_rect.y + box_margin + i * line_spacing  # Position within grey box bounds
         
         # Only draw if within the grey box bounds
-        if (score_rect.y >= box_y + box_margin and 
-            score_rect.bottom <= box_y + box_height - box_margin):
+        if (score_rect.y >= outline_rect.y + box_margin and 
+            score_rect.bottom <= outline_rect.bottom - box_margin):
             screen.blit(score_surface, score_rect)
     
     # Empty leaderboard message
     if len(all_scores) == 0:
-        empty_text = font_medium.render("No scores yet!", True, WHITE)
+        empty_text = text_cache.render(font_medium, "No scores yet!", True, WHITE)
         empty_rect = empty_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(empty_text, empty_rect)
     
+    clear_button = widgets['clear']
+    back_button = widgets['back']
+    
     # Draw scrollbar only if needed
     if len(all_scores) > max_visible_scores:
-        scrollbar.draw(screen)
-    
-    # Buttons at bottom - scaled proportionally
-    button_width = max(80, int(120 * scale_x))
-    button_height = max(30, int(40 * scale_y))
-    button_spacing = max(100, int(140 * scale_x))
-    
-    # Center the buttons
-    total_button_width = button_width * 2 + button_spacing
-    start_x = (SCREEN_WIDTH - total_button_width) // 2
-    button_y = SCREEN_HEIGHT - max(45, int(60 * scale_y))
-    
-    clear_button = Button(
-        start_x,
-        button_y,
-        button_width,
-        button_height,
-        "CLEAR",
-        font_medium,
-        color=YELLOW,
-        hover_color=RED,
-        text_key= 'text_clear'
-    )
-    
-    back_button = Button(
-        start_x + button_width + button_spacing,
-        button_y,
-        button_width,
-        button_height,
-        "BACK",
-        font_medium,
-        hover_color=ORANGE,
-        text_key='text_back'
-    )
-    
-    # Set image manager for buttons
-    clear_button.image_manager = image_manager
-    back_button.image_manager = image_manager
-    
-    # Update hover states
-    mouse_pos = pg.mouse.get_pos()
-    clear_button.update_hover(mouse_pos)
-    back_button.update_hover(mouse_pos)
-    
-    clear_button.draw(screen)
-    back_button.draw(screen)
+        draw_widgets(screen, (clear_button, back_button, scrollbar))
+    else:
+        draw_widgets(screen, (clear_button, back_button))
     
     return clear_button, back_button, scrollbar
 
-cursor_timer = 0
-cursor_visible = True 
-
-def show_username_input():
-    global cursor_timer, cursor_visible
-    draw_background(screen, 'menu')
-
-    # Title with image support
-    draw_text_or_image(screen, None, "ENTER USERNAME", font_large, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+def build_username_widgets():
+    """Create the username screen buttons"""
+    return {
+        'back': Button(0, 0, 0, 0, "BACK", font_small, hover_color=ORANGE, text_key='text_back'),
+        'cursor': TextCursor(),
+    }
 
+def layout_username_widgets(widgets):
+    """Position the username input box and buttons for the current screen size"""
     scale_x = SCREEN_WIDTH / BASE_WIDTH
     scale_y = SCREEN_HEIGHT / BASE_HEIGHT
 
+    button_width = max(80, int(100 * scale_x))
+    button_height = max(30, int(40 * scale_y))
+    button_x = SCREEN_WIDTH - button_width - max(15, int(20 * scale_x))
+    button_y = SCREEN_HEIGHT - button_height - max(15, int(20 * scale_y))
+    widgets['back'].set_rect(button_x, button_y, button_width, button_height)
+    
     input_box = pg.Rect(
         SCREEN_WIDTH // 2 - max(100, int(150 * scale_x)),
         SCREEN_HEIGHT // 2 - max(15, int(20 * scale_y)),
         max(200, int(300 * scale_x)),
         max(30, int(40 * scale_y))
     )
+    return {
+        'input_box': input_box,
+        'border_width': max(2, int(3 * min(scale_x, scale_y))),
+        'cursor_width': max(1, int(2 * min(scale_x, scale_y))),
+        'text_pos': (input_box.x + max(8, int(10 * scale_x)), input_box.y + max(8, int(10 * scale_y))),
+        'instructions_y': SCREEN_HEIGHT // 2 + max(30, int(40 * scale_y)),
+    }
 
-    color = WHITE if input_active else GRAY
-    pg.draw.rect(screen, color, input_box, max(2, int(3 * min(scale_x, scale_y))))
+def show_username_input():
+    draw_background(screen, 'menu')
+
+    # Title with image support
+    draw_text_or_image(screen, None, "ENTER USERNAME", font_large, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+
+    widgets, layout = widget_trees[USERNAME_INPUT].get()
+    input_box = layout['input_box']
 
-    # Cursor
-    cursor_timer += 1
-    if cursor_timer >= 30:
-        cursor_timer = 0
-        cursor_visible = not cursor_visible
+    color = WHITE if input_active else GRAY
+    pg.draw.rect(screen, color, input_box, layout['border_width'])
 
-    username_surface = font_medium.render(current_username, True, WHITE)
-    text_x = input_box.x + max(8, int(10 * scale_x))
-    text_y = input_box.y + max(8, int(10 * scale_y))
+    username_surface = text_cache.render(font_medium, current_username, True, WHITE)
+    text_x, text_y = layout['text_pos']
     screen.blit(username_surface, (text_x, text_y))
 
-    if input_active and cursor_visible:
-        cursor_x = text_x + username_surface.get_width() + 2
-        cursor_y = text_y
-        cursor_height = font_medium.get_height()
-        pg.draw.line(screen, WHITE, (cursor_x, cursor_y), (cursor_x, cursor_y + cursor_height), max(1, int(2 * min(scale_x, scale_y))))
+    # Cursor at the end of the text, it blinks every half second
+    text_cursor = widgets['cursor']
+    text_cursor.active = input_active
+    text_cursor.place(text_x + username_surface.get_width() + 2, text_y, font_medium.get_height(), layout['cursor_width'])
 
     # Instruction text
     if current_username.strip():
-        inst_text = font_small.render("Press ENTER to continue", True, GREEN)
+        inst_text = text_cache.render(font_small, "Press ENTER to continue", True, GREEN)
     else:
-        inst_text = font_small.render("Press ENTER to continue", True, GRAY)
-    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + max(30, int(40 * scale_y))))
+        inst_text = text_cache.render(font_small, "Press ENTER to continue", True, GRAY)
+    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, layout['instructions_y']))
     screen.blit(inst_text, inst_rect)
 
-    button_width = max(80, int(100 * scale_x))
-    button_height = max(30, int(40 * scale_y))
-    button_x = SCREEN_WIDTH - button_width - max(15, int(20 * scale_x))
-    button_y = SCREEN_HEIGHT - button_height - max(15, int(20 * scale_y))
+    back_button = widgets['back']
+    draw_widgets(screen, (back_button, text_cursor))
+    
+    return input_box, back_button
 
-    back_button = Button(
-        button_x,
-        button_y,
-        button_width,
-        button_height,
-        "BACK",
-        font_small,
-        hover_color=ORANGE,
-        text_key='text_back'
-    )
+def build_game_over_widgets():
+    """Create the game over screen buttons"""
+    return {
+        'play_again': Button(0, 0, 0, 0, "PLAY AGAIN", font_small, hover_color=GREEN, text_key='text_play'),
+        'leaderboard': Button(0, 0, 0, 0, "LEADERBOARD", font_small, hover_color=YELLOW, text_key='text_leaderboard'),
+        'menu': Button(0, 0, 0, 0, "MAIN MENU", font_small, text_key= 'text_main_menu'),
+        'quit': Button(0, 0, 0, 0, "QUIT", font_small, hover_color=RED, text_key='text_quit'),
+    }
+
+def layout_game_over_widgets(widgets):
+    """Stack the game over buttons under the score for the current screen size"""
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    line_height = max(25, int(35 * scale_y))
+    start_y = SCREEN_HEIGHT // 3
     
-    # Set image manager for button
-    back_button.image_manager = image_manager
+    button_width = max(80, int(200 * scale_x))
+    button_height = max(30, int(50 * scale_y))
+    button_spacing_y = max(15, int(20 * scale_y))
+
+    start_x = (SCREEN_WIDTH - button_width) // 2
+    buttons_start_y = start_y + line_height * 2  # put it under the score/time text
     
-    # Update hover state
-    mouse_pos = pg.mouse.get_pos()
-    back_button.update_hover(mouse_pos)
+    for i, key in enumerate(('play_again', 'leaderboard', 'menu', 'quit')):
+        widgets[key].set_rect(start_x, buttons_start_y + (button_height + button_spacing_y) * i, button_width, button_height)
     
-    back_button.draw(screen)
-    return input_box, back_button
+    return {'start_y': start_y, 'line_height': line_height}
 
 def show_game_over_screen():
     """Display game over screen with enhanced visuals and multiple options"""
@@ -2314,97 +3834,28 @@ def show_game_over_screen():
     draw_text_or_image(screen, 'text_game_over', "GAME OVER", font_large, RED,
                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 5))
     
+    widgets, layout = widget_trees[GAME_OVER].get()
+    
     # Final score (no breakdown needed since no time bonus)
-    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-    line_height = max(25, int(35 * scale_y))
-    start_y = SCREEN_HEIGHT // 3
+    line_height = layout['line_height']
+    start_y = layout['start_y']
     
     # Final score
-    final_text = font_large.render(f"FINAL SCORE: {final_score:,}", True, YELLOW)
-    final_rect = final_text.get_rect(center=(SCREEN_WIDTH // 2, start_y))
-    screen.blit(final_text, final_rect)
-    
-    # Time survived
-    minutes = survival_time_seconds_final // 60
-    seconds = survival_time_seconds_final % 60
-    time_text = font_medium.render(f"Time Survived: {minutes:02d}:{seconds:02d}", True, GREEN)
-    time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, start_y + line_height))
-    screen.blit(time_text, time_rect)
-    
-    # Buttons - stacked vertically in the center
-    scale_x = SCREEN_WIDTH / BASE_WIDTH
-    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-    button_width = max(80, int(200 * scale_x))
-    button_height = max(30, int(50 * scale_y))
-    button_spacing_y = max(15, int(20 * scale_y))
-
-    # Starting Y so the stack is centered vertically under the text
-    total_height = button_height * 4 + button_spacing_y * 3
-    start_x = (SCREEN_WIDTH - button_width) // 2
-    buttons_start_y = start_y + line_height * 2  # put it under the score/time text
-
-    # Create buttons stacked vertically
-    play_again_button = Button(
-        start_x,
-        buttons_start_y,
-        button_width,
-        button_height,
-        "PLAY AGAIN",
-        font_small,
-        hover_color=GREEN,
-        text_key='text_play'
-    )
-
-    leaderboard_button = Button(
-        start_x,
-        buttons_start_y + (button_height + button_spacing_y) * 1,
-        button_width,
-        button_height,
-        "LEADERBOARD",
-        font_small,
-        hover_color=YELLOW,
-        text_key='text_leaderboard'
-    )
-
-    menu_button = Button(
-        start_x,
-        buttons_start_y + (button_height + button_spacing_y) * 2,
-        button_width,
-        button_height,
-        "MAIN MENU",
-        font_small,
-        text_key= 'text_main_menu'
-    )
-
-    quit_button = Button(
-        start_x,
-        buttons_start_y + (button_height + button_spacing_y) * 3,
-        button_width,
-        button_height,
-        "QUIT",
-        font_small,
-        hover_color=RED,
-        text_key='text_quit'
-    )
-
-    
-    # Set image manager for all buttons
-    for button in [play_again_button, leaderboard_button, menu_button, quit_button]:
-        button.image_manager = image_manager
+    final_text = text_cache.render(font_large, f"FINAL SCORE: {final_score:,}", True, YELLOW)
+    final_rect = final_text.get_rect(center=(SCREEN_WIDTH // 2, start_y))
+    screen.blit(final_text, final_rect)
     
-    # Update hover states
-    mouse_pos = pg.mouse.get_pos()
-    play_again_button.update_hover(mouse_pos)
-    leaderboard_button.update_hover(mouse_pos)
-    menu_button.update_hover(mouse_pos)
-    quit_button.update_hover(mouse_pos)
+    # Time survived
+    minutes = survival_time_seconds_final // 60
+    seconds = survival_time_seconds_final % 60
+    time_text = text_cache.render(font_medium, f"Time Survived: {minutes:02d}:{seconds:02d}", True, GREEN)
+    time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, start_y + line_height))
+    screen.blit(time_text, time_rect)
     
-    play_again_button.draw(screen)
-    leaderboard_button.draw(screen)
-    menu_button.draw(screen)
-    quit_button.draw(screen)
+    buttons = (widgets['play_again'], widgets['leaderboard'], widgets['menu'], widgets['quit'])
+    draw_widgets(screen, buttons)
     
-    return play_again_button, leaderboard_button, menu_button, quit_button
+    return buttons
 
 # BOTTLE EDITING FUNCTIONS
 
@@ -2414,6 +3865,33 @@ edit_field = 0  # 0=color_r, 1=color_g, 2=color_b, 3=width, 4=height, 5=min_curv
 edit_fields = ['color_r', 'color_g', 'color_b', 'width', 'height', 'min_curve', 'max_curve', 'score_gain']
 temp_bottle_config = {}
 
+def build_bottle_edit_widgets():
+    """Create the bottle editing buttons"""
+    return {
+        'save': Button(0, 0, 0, 0, "SAVE", font_small, hover_color=GREEN),
+        'back': Button(0, 0, 0, 0, "BACK", font_small, hover_color=ORANGE, text_key='text_back'),
+    }
+
+def layout_bottle_edit_widgets(widgets):
+    """Position the bottle editing buttons for the current screen size"""
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    
+    # Save and Back buttons
+    button_width = max(80, int(100 * scale_x))
+    button_height = max(30, int(40 * scale_y))
+    button_spacing = max(20, int(30 * scale_x))
+    button_y = SCREEN_HEIGHT - max(45, int(60 * scale_y))
+    
+    widgets['save'].set_rect(SCREEN_WIDTH // 2 - button_width - button_spacing // 2, button_y, button_width, button_height)
+    widgets['back'].set_rect(SCREEN_WIDTH // 2 + button_spacing // 2, button_y, button_width, button_height)
+    
+    return {
+        'preview_size': max(20, int(40 * min(scale_x, scale_y))),
+        'field_spacing': max(25, int(35 * scale_y)),
+        'instructions_y': SCREEN_HEIGHT - max(80, int(100 * scale_y)),
+    }
+
 def show_bottle_edit():
     """Display bottle editing interface with enhanced visuals"""
     global temp_bottle_config, edit_field
@@ -2437,30 +3915,24 @@ def show_bottle_edit():
             'score_gain': config['score_gain']
         }
     
+    widgets, layout = widget_trees[BOTTLE_EDIT].get()
+    
     # Title
-    title_text = font_medium.render(f"Editing: {config['name']}", True, WHITE)
+    title_text = text_cache.render(font_medium, f"Editing: {config['name']}", True, WHITE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 8))
     screen.blit(title_text, title_rect)
     
-    # Dynamic scaling
-    scale_x = SCREEN_WIDTH / BASE_WIDTH
-    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-    
     # Preview bottle
-    preview_size = max(20, int(40 * min(scale_x, scale_y)))
-    preview_x = SCREEN_WIDTH // 4
-    preview_y = SCREEN_HEIGHT // 4
+    preview_size = layout['preview_size']
     preview_color = (temp_bottle_config['color_r'], temp_bottle_config['color_g'], temp_bottle_config['color_b'])
-    preview_rect = pg.Rect(preview_x, preview_y, preview_size, preview_size)
+    preview_rect = pg.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4, preview_size, preview_size)
     
     # Try to use bottle image if available
     if (image_manager and 
         not image_manager.use_fallbacks()):
         
-        bottle_img = image_manager.get_image(f'bottle_{selected_bottle_id}')
-        if bottle_img:
-            # Scale image to preview size
-            scaled_img = pg.transform.scale(bottle_img, (preview_size, preview_size))
+        scaled_img = image_manager.get_scaled_image(f'bottle_{selected_bottle_id}', (preview_size, preview_size))
+        if scaled_img:
             screen.blit(scaled_img, preview_rect.topleft)
         else:
             # Fallback to colored rectangle
@@ -2471,7 +3943,7 @@ def show_bottle_edit():
     
     # Edit fields
     field_start_y = SCREEN_HEIGHT // 3
-    field_spacing = max(25, int(35 * scale_y))
+    field_spacing = layout['field_spacing']
     field_x = SCREEN_WIDTH // 2
     
     for i, field_name in enumerate(edit_fields):
@@ -2489,52 +3961,18 @@ def show_bottle_edit():
         else:
             display_text = f"{field_name.upper()}: {current_value}"
         
-        field_surface = font_small.render(display_text, True, color)
+        field_surface = text_cache.render(font_small, display_text, True, color)
         field_rect = field_surface.get_rect(center=(field_x, y_pos))
         screen.blit(field_surface, field_rect)
     
     # Instructions
-    inst_text = font_small.render("Use UP/DOWN to select field, LEFT/RIGHT to adjust value", True, GRAY)
-    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - max(80, int(100 * scale_y))))
+    inst_text = text_cache.render(font_small, "Use UP/DOWN to select field, LEFT/RIGHT to adjust value", True, GRAY)
+    inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, layout['instructions_y']))
     screen.blit(inst_text, inst_rect)
     
-    # Save and Back buttons
-    button_width = max(80, int(100 * scale_x))
-    button_height = max(30, int(40 * scale_y))
-    button_spacing = max(20, int(30 * scale_x))
-    
-    save_button = Button(
-        SCREEN_WIDTH // 2 - button_width - button_spacing // 2,
-        SCREEN_HEIGHT - max(45, int(60 * scale_y)),
-        button_width,
-        button_height,
-        "SAVE",
-        font_small,
-        hover_color=GREEN
-    )
-    
-    back_button = Button(
-        SCREEN_WIDTH // 2 + button_spacing // 2,
-        SCREEN_HEIGHT - max(45, int(60 * scale_y)),
-        button_width,
-        button_height,
-        "BACK",
-        font_small,
-        hover_color=ORANGE,
-        text_key='text_back'
-    )
-    
-    # Set image manager for buttons
-    save_button.image_manager = image_manager
-    back_button.image_manager = image_manager
-    
-    # Update hover states
-    mouse_pos = pg.mouse.get_pos()
-    save_button.update_hover(mouse_pos)
-    back_button.update_hover(mouse_pos)
-    
-    save_button.draw(screen)
-    back_button.draw(screen)
+    save_button = widgets['save']
+    back_button = widgets['back']
+    draw_widgets(screen, (save_button, back_button))
     
     return save_button, back_button
 
@@ -2603,6 +4041,31 @@ def save_bottle_config():
     bottle_config.save_config()
     logging.info(f"Saved configuration for {config['name']}")
 
+# DIRTY RECT RENDERING
+
+def get_screen_content_key():
+    """Everything the current static screen's content depends on, apart from widget hover and drag state"""
+    key = (current_state, SCREEN_WIDTH, SCREEN_HEIGHT, image_manager.images_version, image_manager.use_fallbacks())
+    
+    if current_state == USERNAME_INPUT:
+        return key + (current_username, input_active)
+    elif current_state == BOTTLE_CONFIG:
+        return key + (bottle_config_scroll,)
+    elif current_state == BOTTLE_EDIT:
+        return key + (selected_bottle_id, edit_field, tuple(temp_bottle_config.items()))
+    elif current_state == LEADERBOARD:
+        return key + (leaderboard_scroll, len(leaderboard.get_all_scores()), current_username)
+    elif current_state == GAME_OVER:
+        return key + (final_score, survival_time_seconds_final)
+    return key
+
+def render_static_screen(draw_screen):
+    """Draw a static screen, through the dirty rect renderer when it is enabled and no fade is running"""
+    if not DIRTY_RECT_RENDERING or fade_direction != 0:
+        dirty_renderer.invalidate()
+        return draw_screen()
+    return dirty_renderer.render(screen, draw_screen, get_screen_content_key())
+
 # FADE TRANSITION FUNCTIONS
 
 def start_fade_transition(target_state):
@@ -2611,9 +4074,6 @@ def start_fade_transition(target_state):
     fade_direction = 1  # Start fade out
     next_state = target_state
     fade_alpha = 0
-    
-    # Ensure window state is proper when transitioning
-    restore_window_state()
 
 def update_fade():
     """Update fade transition and return True if transition is complete"""
@@ -2648,380 +4108,494 @@ def draw_fade():
 
 # GAME LOOP FUNCTION
 
-def safe_game_loop():
-    """Enhanced main game loop with animations and visual effects"""
-    global player_x, player_y, vel_y, is_on_ground, drunk_x, lives, last_bottle_time, bottles, start_time, screen
+def read_player_controls():
+    """Read the player's controls from the keyboard as (move_left, move_right, jump)"""
+    keys = pg.key.get_pressed()
+    return (
+        keys[pg.K_LEFT] or keys[pg.K_a],
+        keys[pg.K_RIGHT] or keys[pg.K_d],
+        keys[pg.K_SPACE] or keys[pg.K_w] or keys[pg.K_UP]
+    )
+
+def simulate_game_tick(controls):
+    """Advance the game by one fixed simulation step, returning the survival time on game over"""
+    global player_x, player_y, vel_y, is_on_ground, drunk_x, lives, last_bottle_time, bottles, start_time
     global score, bottles_dodged, close_calls, combo_multiplier
     global bottle_spawn_time, left_hand_spawn_time, last_left_bottle_time
     global image_manager, visual_effects
     global left_hand_preview, right_hand_preview, left_hand_preview_time, right_hand_preview_time
+    global player_facing_right, sim_time, prev_player_x, prev_player_y
     
-    running = True
-    frame_count = 0
+    sim_time += SIM_STEP_MS
+    prev_player_x, prev_player_y = player_x, player_y
     
-    while running:
-        frame_count += 1
-        current_time = pg.time.get_ticks()
-        
-        # Update all animations
-        image_manager.update_animations()
-        
-        # Update difficulty based on score
-        bottle_spawn_time, left_hand_spawn_time = get_current_difficulty()
-        
-        # Draw background
-        draw_background(screen, 'game')
-        
-        keys = pg.key.get_pressed()
-        
-        # Update player animation state
-        update_player_animation_state()
-        
-        # Update drunk animation state
-        update_drunk_animation()
-        global player_facing_right
-        # Player movement
-        if keys[pg.K_LEFT] or keys[pg.K_a]:
-            player_x = max(0, player_x - player_speed)
-            player_facing_right = False
-            player_last_direction = "left"
-        if keys[pg.K_RIGHT] or keys[pg.K_d]:
-            player_x = min(SCREEN_WIDTH - player_width, player_x + player_speed)
-            player_facing_right = True
-            player_last_direction = "right"
-        
-        # Jumping
-        if (keys[pg.K_SPACE] or keys[pg.K_w] or keys[pg.K_UP]) and is_on_ground:
-            vel_y = jump_power
-            is_on_ground = False
+    # Update all animations
+    image_manager.update_animations()
+    
+    # Update difficulty based on score
+    bottle_spawn_time, left_hand_spawn_time = get_current_difficulty()
+    
+    move_left, move_right, jump = controls
+    
+    # Update player animation state
+    update_player_animation_state(move_left or move_right)
+    
+    # Update drunk animation state
+    update_drunk_animation()
+    
+    # Player movement
+    if move_left:
+        player_x = max(0, player_x - player_speed)
+        player_facing_right = False
+        player_last_direction = "left"
+    if move_right:
+        player_x = min(SCREEN_WIDTH - player_width, player_x + player_speed)
+        player_facing_right = True
+        player_last_direction = "right"
+    
+    # Jumping
+    if jump and is_on_ground:
+        vel_y = jump_power
+        is_on_ground = False
+    
+    # Physics
+    vel_y += gravity
+    player_y += vel_y
+    
+    # Ground collision
+    if player_y >= player_base_y:
+        player_y = player_base_y
+        vel_y = 0
+        is_on_ground = True
+    profiler.lap('physics')
+    
+    # Calculate hand positions for preview bottles
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    
+    # Right hand position (right side of drunk guy)
+    right_hand_x = drunk_x + drunk_width + max(10, int(15 * scale_x))
+    right_hand_y = drunk_y + drunk_height // 3  # Upper part for right hand
+    
+    # Left hand position (left side of drunk guy)
+    left_hand_x = drunk_x - max(15, int(20 * scale_x))
+    left_hand_y = drunk_y + drunk_height // 3  # Upper part for left hand
+    
+    # RIGHT HAND: Bottle preview and spawning system
+    if right_hand_preview is None:
+        # Time to show a new preview bottle from right hand
+        if sim_time - last_bottle_time > bottle_spawn_time:
+            # Get random bottle type based on spawn weights
+            bottle_type_id = bottle_config.get_random_bottle_type()
+            bottle_config_data = bottle_config.get_bottle_config(bottle_type_id)
+            
+            # Create preview bottle (not thrown yet)
+            right_hand_preview = {
+                'type_id': bottle_type_id,
+                'config': bottle_config_data,
+                'color': bottle_config_data['color']
+            }
+            right_hand_preview_time = sim_time
+    
+    # LEFT HAND: Bottle preview and spawning system
+    if left_hand_preview is None:
+        # Time to show a new preview bottle from left hand
+        if sim_time - last_left_bottle_time > left_hand_spawn_time:
+            # Get random bottle type based on spawn weights
+            bottle_type_id = bottle_config.get_random_bottle_type()
+            bottle_config_data = bottle_config.get_bottle_config(bottle_type_id)
+            
+            # Create preview bottle (not thrown yet)
+            left_hand_preview = {
+                'type_id': bottle_type_id,
+                'config': bottle_config_data,
+                'color': bottle_config_data['color']
+            }
+            left_hand_preview_time = sim_time
+    
+    # Check if it's time to throw bottles from hands
+    # RIGHT HAND throwing
+    if right_hand_preview is not None and sim_time - right_hand_preview_time >= next_bottle_throw_delay:
+        # Trigger right hand throwing animation
+        trigger_drunk_throw("right")
         
-        # Physics
-        vel_y += gravity
-        player_y += vel_y
+        # Create bottle from right hand
+        scale_x = SCREEN_WIDTH / BASE_WIDTH
+        scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+        right_hand_x = drunk_x + drunk_width + max(10, int(15 * scale_x))
+        right_hand_y = drunk_y + drunk_height // 3
+        preview_size = max(8, int(12 * min(scale_x, scale_y)))
         
-        # Ground collision
-        if player_y >= player_base_y:
-            player_y = player_base_y
-            vel_y = 0
-            is_on_ground = True
+        spawn_bottle(
+            right_hand_x + preview_size // 2,
+            right_hand_y + preview_size // 2,
+            player_x + player_width // 2,
+            player_base_y + player_height + 30,  # Target below the player
+            right_hand_preview['type_id'],
+            "right",
+            is_preview_transition=True
+        )
         
-        # Draw animated drunk guy
-        draw_animated_drunk(screen, drunk_x, drunk_y, drunk_width, drunk_height)
+        # Reset for next bottle
+        right_hand_preview = None
+        last_bottle_time = sim_time
+    
+    # LEFT HAND throwing
+    if left_hand_preview is not None and sim_time - left_hand_preview_time >= next_left_bottle_throw_delay:
+        # Trigger left hand throwing animation
+        trigger_drunk_throw("left")
         
-        # Calculate hand positions for preview bottles
+        # Create bottle from left hand
         scale_x = SCREEN_WIDTH / BASE_WIDTH
         scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+        left_hand_x = drunk_x - max(15, int(20 * scale_x))
+        left_hand_y = drunk_y + drunk_height // 3
+        preview_size = max(8, int(12 * min(scale_x, scale_y)))
         
-        # Right hand position (right side of drunk guy)
-        right_hand_x = drunk_x + drunk_width + max(10, int(15 * scale_x))
-        right_hand_y = drunk_y + drunk_height // 3  # Upper part for right hand
+        spawn_bottle(
+            left_hand_x + preview_size // 2,
+            left_hand_y + preview_size // 2,
+            player_x + player_width // 2,
+            player_base_y + player_height + 30,  # Target below the player
+            left_hand_preview['type_id'],
+            "left",
+            is_preview_transition=True
+        )
         
-        # Left hand position (left side of drunk guy)
-        left_hand_x = drunk_x - max(15, int(20 * scale_x))
-        left_hand_y = drunk_y + drunk_height // 3  # Upper part for left hand
-        
-        # RIGHT HAND: Bottle preview and spawning system
-        if right_hand_preview is None:
-            # Time to show a new preview bottle from right hand
-            if current_time - last_bottle_time > bottle_spawn_time:
-                # Get random bottle type based on spawn weights
-                bottle_type_id = bottle_config.get_random_bottle_type()
-                bottle_config_data = bottle_config.get_bottle_config(bottle_type_id)
+        # Reset for next bottle
+        left_hand_preview = None
+        last_left_bottle_time = sim_time
+    profiler.lap('spawning')
+    
+    # Update bottles and remove the ones that finished or hit the player
+    bottles_to_remove = []
+    
+    # Advance every bottle first so collisions can be tested in one batch
+    if bottle_engine:
+        finished = bottle_engine.update_all()
+    else:
+        finished = [bottle.update() for bottle in bottles]
+    hit_indices, close_call_indices = detect_bottle_collisions(
+        player_x, player_y, player_width, player_height, not is_on_ground, finished)
+    
+    for i, bottle in enumerate(bottles):
+        if finished[i]:
+            # Bottle has moved past the target - check if it should be scored as dodged
+            if not bottle.hit_player and not bottle.scored:
+                # Check if this was a close call using the improved detection
+                is_close_call = i in close_call_indices
+                
+                # Calculate score using bottle-specific score gain
+                base_points = bottle.config['score_gain']
+                if is_close_call:
+                    base_points = int(base_points * 2.5)  # Close calls get 2.5x multiplier
+                if bottle.bottle_type == "air":
+                    base_points = int(base_points * 1.5)  # Air bottles get additional 1.5x multiplier
+                
+                points = int(base_points * combo_multiplier)
+                
+                # Add to score
+                score += points
+                bottles_dodged += 1
+                if is_close_call:
+                    close_calls += 1
                 
-                # Create preview bottle (not thrown yet)
-                right_hand_preview = {
-                    'type_id': bottle_type_id,
-                    'config': bottle_config_data,
-                    'color': bottle_config_data['color']
-                }
-                right_hand_preview_time = current_time
-        
-        # LEFT HAND: Bottle preview and spawning system
-        if left_hand_preview is None:
-            # Time to show a new preview bottle from left hand
-            if current_time - last_left_bottle_time > left_hand_spawn_time:
-                # Get random bottle type based on spawn weights
-                bottle_type_id = bottle_config.get_random_bottle_type()
-                bottle_config_data = bottle_config.get_bottle_config(bottle_type_id)
+                # Update combo system (no timer limit)
+                combo_multiplier = min(MAX_COMBO, combo_multiplier + COMBO_INCREMENT)
                 
-                # Create preview bottle (not thrown yet)
-                left_hand_preview = {
-                    'type_id': bottle_type_id,
-                    'config': bottle_config_data,
-                    'color': bottle_config_data['color']
-                }
-                left_hand_preview_time = current_time
-        
-        # Check if it's time to throw bottles from hands
-        # RIGHT HAND throwing
-        if right_hand_preview is not None and current_time - right_hand_preview_time >= next_bottle_throw_delay:
-            # Trigger right hand throwing animation
-            trigger_drunk_throw("right")
+                # Add visual feedback with bottle name
+                add_score_popup(
+                    bottle.x, bottle.y - 30, 
+                    points, is_close_call, combo_multiplier, bottle.name
+                )
+                
+                bottle.scored = True
+                dodge_log.info("%s dodged! Points: %s (base: %s, combo: x%.1f) Close call: %s",
+                               bottle.name, points, base_points, combo_multiplier, is_close_call)
             
-            # Create bottle from right hand
-            scale_x = SCREEN_WIDTH / BASE_WIDTH
-            scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-            right_hand_x = drunk_x + drunk_width + max(10, int(15 * scale_x))
-            right_hand_y = drunk_y + drunk_height // 3
-            preview_size = max(8, int(12 * min(scale_x, scale_y)))
+            bottles_to_remove.append(i)
+        elif bottle.hit_player:
+            # Remove bottles that have hit the player
+            bottles_to_remove.append(i)
+        elif i in hit_indices:
+            # Collision detection with proper height/type matching
+            lives -= 1
+            bottle.hit_player = True  # Mark for removal
+            bottles_to_remove.append(i)
             
-            new_bottle = Bottle(
-                right_hand_x + preview_size // 2,
-                right_hand_y + preview_size // 2,
-                player_x + player_width // 2,
-                player_base_y + player_height + 30,  # Target below the player
-                right_hand_preview['type_id'],
-                "right",
-                is_preview_transition=True
-            )
-            new_bottle.image_manager = image_manager
-            bottles.append(new_bottle)
+            # Create impact effect for special bottles
+            effect = bottle.create_impact_effect()
+            if effect:
+                visual_effects.append(effect)
             
-            # Reset for next bottle
-            right_hand_preview = None
-            last_bottle_time = current_time
-        
-        # LEFT HAND throwing
-        if left_hand_preview is not None and current_time - left_hand_preview_time >= next_left_bottle_throw_delay:
-            # Trigger left hand throwing animation
-            trigger_drunk_throw("left")
+            # Reset combo when hit
+            combo_multiplier = 1.0
             
-            # Create bottle from left hand
-            scale_x = SCREEN_WIDTH / BASE_WIDTH
-            scale_y = SCREEN_HEIGHT / BASE_HEIGHT
-            left_hand_x = drunk_x - max(15, int(20 * scale_x))
-            left_hand_y = drunk_y + drunk_height // 3
-            preview_size = max(8, int(12 * min(scale_x, scale_y)))
+            # Enhanced logging with bottle type and hand
+            jump_status = "jumping" if not is_on_ground else "on ground"
+            hit_log.info("Player hit while %s by %s hand %s (z=%.3f, player_z=0.2-1.0)! Lives remaining: %s",
+                         jump_status, bottle.hand, bottle.name, bottle.z, lives)
+            
+            if lives <= 0:
+                logging.info("Game over - no lives remaining")
+                calculate_final_score()
+                global survival_time_seconds_final
+                survival_time_seconds_final = int(sim_time - start_time) // 1000
+                return survival_time_seconds_final  # Return frozen survival time
+
+    # Remove finished bottles and return them to the pool
+    remove_bottles(set(bottles_to_remove))
+    profiler.lap('bottles')
+    
+    # Update visual effects and remove finished ones
+    update_pooled_objects(visual_effects, effect_pool)
+    
+    # Update score popups
+    update_score_popups()
+    profiler.lap('effects')
+    
+    return None
+
+def build_game_widgets():
+    """Create the in-game buttons"""
+    return {'back': Button(0, 0, 0, 0, "BACK", font_small, hover_color=ORANGE, text_key='text_back')}
+
+def layout_game_widgets(widgets):
+    """Position the in-game back button for the current screen size"""
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    
+    button_width = max(80, int(100 * scale_x))
+    button_height = max(30, int(40 * scale_y))
+    button_x = SCREEN_WIDTH - button_width - max(15, int(20 * scale_x))
+    button_y = SCREEN_HEIGHT - button_height - max(15, int(20 * scale_y))
+    widgets['back'].set_rect(button_x, button_y, button_width, button_height)
+    
+    return {}
+
+def draw_game_frame(alpha):
+    """Draw the game scene, interpolating moving objects between the last two simulation steps"""
+    # Draw background
+    draw_background(screen, 'game')
+    profiler.lap('background')
+    
+    # Draw animated drunk guy
+    draw_animated_drunk(screen, drunk_x, drunk_y, drunk_width, drunk_height)
+    profiler.lap('sprites')
+    
+    # Separate bottles by z-position for proper layering
+    bottles_behind = []
+    bottles_in_front = []
+    for bottle in bottles:
+        if bottle.z > 1.0:
+            bottles_in_front.append(bottle)
+        else:
+            bottles_behind.append(bottle)
+    
+    # Draw bottles behind player
+    for bottle in bottles_behind:
+        bottle.draw(screen, alpha)
+    profiler.lap('bottle_draw')
+    
+    # Draw animated player
+    draw_player_x = prev_player_x + (player_x - prev_player_x) * alpha
+    draw_player_y = prev_player_y + (player_y - prev_player_y) * alpha
+    draw_animated_player(screen, draw_player_x, draw_player_y, player_width, player_height)
+    profiler.lap('sprites')
+    
+    # Draw bottles in front of player
+    for bottle in bottles_in_front:
+        bottle.draw(screen, alpha)
+    profiler.lap('bottle_draw')
+    
+    # Draw visual effects on top
+    for effect in visual_effects:
+        effect.draw(screen)
+    
+    # Draw score popups on top
+    draw_score_popups(screen)
+    profiler.lap('sprites')
+    
+    # Simplified HUD - scaled proportionally
+    scale_x = SCREEN_WIDTH / BASE_WIDTH
+    scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+    
+    # Lives on top-left with color coding
+    lives_color = GREEN if lives > 6 else ORANGE if lives > 3 else RED
+    life_text = text_cache.render(font_small, f"Lives: {lives}", True, lives_color)
+    screen.blit(life_text, (max(10, int(15 * scale_x)), max(10, int(15 * scale_y))))
+    
+    # Score on top-center
+    score_text = text_cache.render_number(font_medium, "Score: ", f"{score:,}", True, WHITE)
+    score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, max(20, int(25 * scale_y))))
+    screen.blit(score_text, score_rect)
+    
+    # Combo multiplier (always show since no timer limit)
+    if combo_multiplier > 1.0:
+        combo_text = text_cache.render(font_small, f"COMBO x{combo_multiplier:.1f}", True, BLUE)
+        combo_rect = combo_text.get_rect(center=(SCREEN_WIDTH // 2, max(45, int(55 * scale_y))))
+        screen.blit(combo_text, combo_rect)
+    
+    # Time survived on top-right
+    time_survived = int(sim_time - start_time) // 1000
+    minutes = time_survived // 60
+    seconds = time_survived % 60
+    time_text = text_cache.render(font_small, f"Time: {minutes:02d}:{seconds:02d}", True, GREEN)
+    time_rect = time_text.get_rect()
+    screen.blit(time_text, (SCREEN_WIDTH - time_rect.width - max(10, int(15 * scale_x)), max(10, int(15 * scale_y))))
+    
+    # Back button
+    back_button = widget_trees[PLAYING].get()[0]['back']
+    
+    # Update hover state for back button
+    mouse_pos = pg.mouse.get_pos()
+    back_button.update_hover(mouse_pos)
+    
+    back_button.draw(screen)
+    profiler.draw(screen)
+    profiler.lap('hud')
+    return back_button
+
+def safe_game_loop():
+    """Enhanced main game loop with a fixed-timestep simulation and interpolated rendering"""
+    global prev_player_x, prev_player_y
+    
+    running = True
+    frame_count = 0
+    
+    # Simulation time runs in fixed steps from the start of the game, with a fresh seed per game
+    start_game_clock()
+    recorder = start_replay_recording(seed_game()) if RECORD_REPLAYS else None
+    prev_player_x, prev_player_y = player_x, player_y
+    accumulator = 0.0
+    clock.tick()
+    
+    try:
+        while running:
+            frame_count += 1
+            profiler.next_frame()
+            controls = read_player_controls()
+            profiler.lap('input')
             
-            new_bottle = Bottle(
-                left_hand_x + preview_size // 2,
-                left_hand_y + preview_size // 2,
-                player_x + player_width // 2,
-                player_base_y + player_height + 30,  # Target below the player
-                left_hand_preview['type_id'],
-                "left",
-                is_preview_transition=True
-            )
-            new_bottle.image_manager = image_manager
-            bottles.append(new_bottle)
+            # Run as many fixed steps as real time calls for, dropping the backlog under load spikes
+            steps = 0
+            while accumulator >= SIM_STEP_MS:
+                if steps >= MAX_SIM_STEPS_PER_FRAME:
+                    accumulator = 0.0
+                    break
+                if recorder:
+                    recorder.record(controls)
+                survival_time = simulate_game_tick(controls)
+                if survival_time is not None:
+                    return survival_time
+                accumulator -= SIM_STEP_MS
+                steps += 1
             
-            # Reset for next bottle
-            left_hand_preview = None
-            last_left_bottle_time = current_time
-        
-        # Update bottles and separate by layer
-        bottles_to_remove = []
-        bottles_behind = []
-        bottles_in_front = []
-        
-        for i, bottle in enumerate(bottles):
-            if bottle.update():
-                # Bottle has moved past the target - check if it should be scored as dodged
-                if not bottle.hit_player and not bottle.scored:
-                    # Check if this was a close call using the improved detection
-                    is_close_call = bottle.is_close_call(player_x, player_y, player_width, player_height, not is_on_ground)
-                    
-                    # Calculate score using bottle-specific score gain
-                    base_points = bottle.config['score_gain']
-                    if is_close_call:
-                        base_points = int(base_points * 2.5)  # Close calls get 2.5x multiplier
-                    if bottle.bottle_type == "air":
-                        base_points = int(base_points * 1.5)  # Air bottles get additional 1.5x multiplier
-                    
-                    points = int(base_points * combo_multiplier)
-                    
-                    # Add to score
-                    score += points
-                    bottles_dodged += 1
-                    if is_close_call:
-                        close_calls += 1
-                    
-                    # Update combo system (no timer limit)
-                    combo_multiplier = min(MAX_COMBO, combo_multiplier + COMBO_INCREMENT)
-                    
-                    # Add visual feedback with bottle name
-                    add_score_popup(
-                        bottle.x, bottle.y - 30, 
-                        points, is_close_call, combo_multiplier, bottle.name
-                    )
-                    
-                    bottle.scored = True
-                    logging.info(f"{bottle.name} dodged! Points: {points} (base: {base_points}, combo: x{combo_multiplier:.1f}) Close call: {is_close_call}")
-                
-                bottles_to_remove.append(i)
-            elif bottle.hit_player:
-                # Remove bottles that have hit the player
-                bottles_to_remove.append(i)
-            else:
-                # Determine current player z-range based on jumping state
-                if is_on_ground:
-                    current_player_z_start = 0.2
-                    current_player_z_end = 1.0
-                else:
-                    current_player_z_start = 0.2
-                    current_player_z_end = 1.0
-                
-                # Separate bottles by z-position for proper layering
-                if bottle.z < current_player_z_start:
-                    bottles_behind.append(bottle)
-                elif bottle.z > current_player_z_end:
-                    bottles_in_front.append(bottle)
-                else:
-                    # Bottle is in player's current z-space - potential collision
-                    bottles_behind.append(bottle)  # Draw in front for visibility
+            back_button = draw_game_frame(accumulator / SIM_STEP_MS)
+            
+            # Event handling, window events go through the same handler as every other state
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    logging.info("User quit game")
+                    return -1
+                handle_window_event(event)
                 
-                # Collision detection with proper height/type matching
-                if bottle.is_in_player_collision_zone(not is_on_ground):
-                    player_rect = pg.Rect(int(player_x), int(player_y), player_width, player_height)
-                    bottle_collision_rect = bottle.get_collision_rect(not is_on_ground)
-                    
-                    if (bottle_collision_rect.width > 0 and bottle_collision_rect.height > 0 and
-                        player_rect.colliderect(bottle_collision_rect)):
-                        lives -= 1
-                        bottle.hit_player = True  # Mark for removal
-                        bottles_to_remove.append(i)
-                        
-                        # Create impact effect for special bottles
-                        effect = bottle.create_impact_effect()
-                        if effect:
-                            visual_effects.append(effect)
-                        
-                        # Reset combo when hit
-                        combo_multiplier = 1.0
-                        
-                        # Enhanced logging with bottle type and hand
-                        jump_status = "jumping" if not is_on_ground else "on ground"
-                        player_z = f"{current_player_z_start:.1f}-{current_player_z_end:.1f}"
-                        logging.info(f"Player hit while {jump_status} by {bottle.hand} hand {bottle.name} (z={bottle.z:.3f}, player_z={player_z})! Lives remaining: {lives}")
-                        
-                        if lives <= 0:
-                            logging.info("Game over - no lives remaining")
-                            calculate_final_score()
-                            global survival_time_seconds_final
-                            survival_time_seconds_final = (current_time - start_time) // 1000
-                            return survival_time_seconds_final  # Return frozen survival time
-
-        # Remove bottles safely (reverse order to maintain indices)
-        for i in reversed(sorted(set(bottles_to_remove))):
-            if 0 <= i < len(bottles):
-                bottles.pop(i)
-        
-        # Update visual effects
-        effects_to_remove = []
-        for i, effect in enumerate(visual_effects):
-            if effect.update():
-                effects_to_remove.append(i)
-        
-        # Remove finished effects
-        for i in reversed(effects_to_remove):
-            visual_effects.pop(i)
-        
-        # Update score popups
-        update_score_popups()
-        
-        # Draw bottles behind player
-        for bottle in bottles_behind:
-            bottle.draw(screen)
-        
-        # Draw animated player
-        draw_animated_player(screen, player_x, player_y, player_width, player_height)
-        
-        # Draw bottles in front of player
-        for bottle in bottles_in_front:
-            bottle.draw(screen)
-        
-        # Draw visual effects on top
-        for effect in visual_effects:
-            effect.draw(screen)
-        
-        # Draw score popups on top
-        draw_score_popups(screen)
-        
-        # Simplified HUD - scaled proportionally
-        scale_x = SCREEN_WIDTH / BASE_WIDTH
-        scale_y = SCREEN_HEIGHT / BASE_HEIGHT
+                if event.type == pg.KEYDOWN:
+                    if event.key == pg.K_ESCAPE:
+                        logging.info("User pressed escape")
+                        return -1
+                    elif event.key == pg.K_F3:
+                        profiler.toggle()
+                    elif event.key == pg.K_F4 and profiler.enabled:
+                        profiler.dump(PROFILER_DUMP_FILE)
+                elif event.type == pg.MOUSEBUTTONDOWN:
+                    if back_button.handle_event(event):
+                        logging.info("Back button clicked during gameplay")
+                        return -1
+                elif event.type == pg.VIDEORESIZE:
+                    # Reset game elements to the new screen size, the recording restarts with the new game
+                    reset_game()
+                    if recorder:
+                        recorder = start_replay_recording(seed_game())
+                    accumulator = 0.0
+            profiler.lap('input')
+            
+            # Update display
+            pg.display.flip()
+            profiler.lap('flip')
+            accumulator += clock.tick(RENDER_FPS)
+    finally:
+        if recorder:
+            recorder.save(REPLAY_FILE)
+        logging.info(f"Object pools: {get_pool_stats()}")
+        logging.info(f"Text cache: {text_cache.get_stats()}")
+
+# MAIN FUNCTION AND GAME LOOP
+
+def handle_window_event(event):
+    """Track window state from its events, the same way in every state"""
+    global SCREEN_WIDTH, SCREEN_HEIGHT, fade_surface, window_minimized
+    
+    if event.type in (pg.WINDOWMAXIMIZED, pg.WINDOWRESTORED):
+        window_minimized = False
+    
+    if event.type == pg.VIDEORESIZE and not is_fullscreen:
+        # Handle window resize
+        new_width, new_height = event.w, event.h
+        SCREEN_WIDTH = new_width
+        SCREEN_HEIGHT = new_height
+        update_screen_dimensions(new_width, new_height)
         
-        # Lives on top-left with color coding
-        lives_color = GREEN if lives > 6 else ORANGE if lives > 3 else RED
-        life_text = font_small.render(f"Lives: {lives}", True, lives_color)
-        screen.blit(life_text, (max(10, int(15 * scale_x)), max(10, int(15 * scale_y))))
-        
-        # Score on top-center
-        score_text = font_medium.render(f"Score: {score:,}", True, WHITE)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, max(20, int(25 * scale_y))))
-        screen.blit(score_text, score_rect)
-        
-        # Combo multiplier (always show since no timer limit)
-        if combo_multiplier > 1.0:
-            combo_text = font_small.render(f"COMBO x{combo_multiplier:.1f}", True, BLUE)
-            combo_rect = combo_text.get_rect(center=(SCREEN_WIDTH // 2, max(45, int(55 * scale_y))))
-            screen.blit(combo_text, combo_rect)
-        
-        # Time survived on top-right
-        time_survived = (current_time - start_time) // 1000
-        minutes = time_survived // 60
-        seconds = time_survived % 60
-        time_text = font_small.render(f"Time: {minutes:02d}:{seconds:02d}", True, GREEN)
-        time_rect = time_text.get_rect()
-        screen.blit(time_text, (SCREEN_WIDTH - time_rect.width - max(10, int(15 * scale_x)), max(10, int(15 * scale_y))))
-        
-        # Back button
-        button_width = max(80, int(100 * scale_x))
-        button_height = max(30, int(40 * scale_y))
-        button_x = SCREEN_WIDTH - button_width - max(15, int(20 * scale_x))
-        button_y = SCREEN_HEIGHT - button_height - max(15, int(20 * scale_y))
-
-        back_button = Button(
-            button_x,
-            button_y,
-            button_width,
-            button_height,
-            "BACK",
-            font_small,
-            hover_color=ORANGE,
-            text_key='text_back'
-        )
+        # Recreate fade surface with new dimensions
+        fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        fade_surface.fill((0, 0, 0))
         
-        # Set image manager for button
-        back_button.image_manager = image_manager
+    elif event.type == pg.WINDOWMAXIMIZED and not is_fullscreen:
+        # Handle window maximize - update to full screen dimensions
+        # Get the actual window dimensions after maximize
+        SCREEN_WIDTH = screen.get_width()
+        SCREEN_HEIGHT = screen.get_height()
+        update_screen_dimensions(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Update hover state for back button
-        mouse_pos = pg.mouse.get_pos()
-        back_button.update_hover(mouse_pos)
+        # Recreate fade surface with new dimensions
+        fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        fade_surface.fill((0, 0, 0))
+        logging.info(f"Window maximized: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
         
-        back_button.draw(screen)
+    elif event.type == pg.WINDOWRESTORED and not is_fullscreen:
+        # Handle window restore - update to restored dimensions
+        # Get the actual window dimensions after restore
+        SCREEN_WIDTH = screen.get_width()
+        SCREEN_HEIGHT = screen.get_height()
+        update_screen_dimensions(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Event handling
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                logging.info("User quit game")
-                return -1
-            elif event.type == pg.KEYDOWN:
-                if event.key == pg.K_ESCAPE:
-                    logging.info("User pressed escape")
-                    return -1
-            elif event.type == pg.MOUSEBUTTONDOWN:
-                if back_button.handle_event(event):
-                    logging.info("Back button clicked during gameplay")
-                    return -1
-            elif event.type == pg.VIDEORESIZE:
-                # Handle window resize
-                new_width, new_height = event.w, event.h
-                update_screen_dimensions(new_width, new_height)
-                # Reset game elements to new screen size
-                reset_game()
+        # Recreate fade surface with new dimensions
+        fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        fade_surface.fill((0, 0, 0))
+        logging.info(f"Window restored: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
         
-        # Update display
-        pg.display.flip()
-        clock.tick(60)
-
-# MAIN FUNCTION AND GAME LOOP
+    elif event.type == pg.WINDOWMINIMIZED:
+        window_minimized = True
+        logging.info("Window minimized")
+        
+    elif event.type == pg.WINDOWFOCUSGAINED:
+        # Handle window focus gained - pick up any size change that happened while away
+        logging.info("Window focus gained")
+        restore_window_state()
+        
+    elif event.type == pg.WINDOWFOCUSLOST:
+        # Handle window focus lost - just log it
+        logging.info("Window focus lost")
+        
+    elif event.type == pg.WINDOWEXPOSED:
+        # The window contents were lost, static screens need a full redraw
+        dirty_renderer.invalidate()
 
 def main():
     """Enhanced main game function with animations and visual effects"""
     global current_state, current_username, input_active, final_score, is_fullscreen, screen, leaderboard, leaderboard_scroll
-    global SCREEN_WIDTH, SCREEN_HEIGHT, font_large, font_medium, font_small, fade_direction, next_state
-    global bottle_config_scroll, image_manager, bottle_config_scrollbar, scrollbar, fade_surface
+    global font_large, font_medium, font_small, fade_direction, next_state
+    global bottle_config_scroll, image_manager, bottle_config_scrollbar, scrollbar
 
     leaderboard = LeaderboardManager()
     
@@ -3039,79 +4613,29 @@ def main():
     # Ensure window is in proper state
     restore_window_state()
     
+    # Event types nothing handles are dropped by SDL and never reach Python
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(HANDLED_EVENT_TYPES)
+    
     try:
         while True:
             # Update fade transition
             update_fade()
             
-            # Periodic window state check (every 60 frames = 1 second at 60 FPS)
-            if pg.time.get_ticks() % 1000 < 16:  # Check roughly once per second
-                restore_window_state()
-            
-            # Handle global resize events for all states
-            for event in pg.event.get():
+            # Read the queue once per frame, window events are handled first and the same list then goes to the current state
+            events = pg.event.get()
+            for event in events:
                 if event.type == pg.QUIT:
                     return
-                elif event.type == pg.VIDEORESIZE and not is_fullscreen:
-                    # Handle window resize
-                    new_width, new_height = event.w, event.h
-                    SCREEN_WIDTH = new_width
-                    SCREEN_HEIGHT = new_height
-                    update_screen_dimensions(new_width, new_height)
-                    
-                    # Recreate fade surface with new dimensions
-                    fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                    fade_surface.fill((0, 0, 0))
-                    
-                elif event.type == pg.WINDOWMAXIMIZED and not is_fullscreen:
-                    # Handle window maximize - update to full screen dimensions
-                    # Get the actual window dimensions after maximize
-                    SCREEN_WIDTH = screen.get_width()
-                    SCREEN_HEIGHT = screen.get_height()
-                    update_screen_dimensions(SCREEN_WIDTH, SCREEN_HEIGHT)
-                    
-                    # Recreate fade surface with new dimensions
-                    fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                    fade_surface.fill((0, 0, 0))
-                    logging.info(f"Window maximized: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-                    
-                elif event.type == pg.WINDOWRESTORED and not is_fullscreen:
-                    # Handle window restore - update to restored dimensions
-                    # Get the actual window dimensions after restore
-                    SCREEN_WIDTH = screen.get_width()
-                    SCREEN_HEIGHT = screen.get_height()
-                    update_screen_dimensions(SCREEN_WIDTH, SCREEN_HEIGHT)
-                    
-                    # Recreate fade surface with new dimensions
-                    fade_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                    fade_surface.fill((0, 0, 0))
-                    logging.info(f"Window restored: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-                    
-                elif event.type == pg.WINDOWMINIMIZED:
-                    # Handle window minimize - just log it for now
-                    logging.info("Window minimized")
-                    
-                elif event.type == pg.WINDOWFOCUSGAINED:
-                    # Handle window focus gained - ensure proper state
-                    logging.info("Window focus gained")
-                    restore_window_state()
-                    
-                elif event.type == pg.WINDOWFOCUSLOST:
-                    # Handle window focus lost - just log it
-                    logging.info("Window focus lost")
-                    
-                # Re-queue the event for state-specific handling
-                pg.event.post(event)
+                handle_window_event(event)
             
             # Only process input if not in the middle of a fade transition
             if fade_direction == 0:
                 if current_state == LOADING:
                     show_loading_screen()
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_RETURN:
                                 # Skip loading screen with spacebar (optional)
                                 start_fade_transition(MENU)
@@ -3123,12 +4647,10 @@ def main():
                                 start_fade_transition(MENU)
                 
                 elif current_state == MENU:
-                    play_btn, settings_btn, bottle_config_btn, leaderboard_btn, exit_btn = show_menu()
+                    play_btn, settings_btn, bottle_config_btn, leaderboard_btn, exit_btn = render_static_screen(show_menu)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                                 return
@@ -3151,12 +4673,10 @@ def main():
                             return
                 
                 elif current_state == USERNAME_INPUT:
-                    input_box, back_button = show_username_input()
+                    input_box, back_button = render_static_screen(show_username_input)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                             elif event.key == pg.K_RETURN:
@@ -3178,8 +4698,6 @@ def main():
                                 start_fade_transition(MENU)
 
                 elif current_state == PLAYING:
-                    global start_time
-                    start_time = pg.time.get_ticks()
                     survival_time = safe_game_loop()
                     if survival_time == -1:  # User quit or escaped
                         start_fade_transition(MENU)
@@ -3189,12 +4707,10 @@ def main():
                         start_fade_transition(GAME_OVER)
                 
                 elif current_state == SETTINGS:
-                    back_btn = show_settings()  
+                    back_btn = render_static_screen(show_settings)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                         
@@ -3202,12 +4718,10 @@ def main():
                             start_fade_transition(MENU)
                 
                 elif current_state == BOTTLE_CONFIG:
-                    back_btn, config_scrollbar, visible_bottles, list_start_y, line_spacing = show_bottle_config()
+                    back_btn, config_scrollbar, visible_bottles, list_start_y, line_spacing = render_static_screen(show_bottle_config)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                             elif event.key == pg.K_UP:
@@ -3278,12 +4792,10 @@ def main():
                                     config_scrollbar.set_scroll_position(bottle_config_scroll)
                 
                 elif current_state == BOTTLE_EDIT:
-                    save_btn, back_btn = show_bottle_edit()
+                    save_btn, back_btn = render_static_screen(show_bottle_edit)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(BOTTLE_CONFIG)
                         elif event.type == pg.MOUSEBUTTONDOWN:
@@ -3297,12 +4809,10 @@ def main():
                         handle_bottle_edit_events(event)
                 
                 elif current_state == LEADERBOARD:
-                    clear_btn, back_btn, scrollbar = show_leaderboard()
+                    clear_btn, back_btn, scrollbar = render_static_screen(show_leaderboard)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                             elif event.key == pg.K_UP:
@@ -3362,12 +4872,10 @@ def main():
                                     scrollbar.set_scroll_position(leaderboard_scroll)
         
                 elif current_state == GAME_OVER:
-                    play_again_btn, leaderboard_btn, menu_btn, quit_btn = show_game_over_screen()
+                    play_again_btn, leaderboard_btn, menu_btn, quit_btn = render_static_screen(show_game_over_screen)
                     
-                    for event in pg.event.get():
-                        if event.type == pg.QUIT:
-                            return
-                        elif event.type == pg.KEYDOWN:
+                    for event in events:
+                        if event.type == pg.KEYDOWN:
                             if event.key == pg.K_ESCAPE:
                                 start_fade_transition(MENU)
                             elif event.key == pg.K_RETURN:
@@ -3405,25 +4913,169 @@ def main():
                 elif current_state == GAME_OVER:
                     show_game_over_screen()
                 
-                # Clear event queue during transitions to prevent input buildup
-                pg.event.clear()
+                # This frame's events are dropped during transitions to prevent input buildup
             
             # Draw fade overlay last (on top of everything)
             draw_fade()
             
-            pg.display.flip()
-            clock.tick(60)
+            if dirty_renderer.presented:
+                # A static screen already pushed its changed regions, slow down once it has been idle for a while
+                dirty_renderer.presented = False
+                clock.tick(IDLE_RENDER_FPS if dirty_renderer.is_idle() else 60)
+            else:
+                pg.display.flip()
+                clock.tick(60)
             
     except Exception as e:
         logging.error(f"Error in main loop: {e}")
     finally:
         try:
+            logging.info(f"Display mode switches this session: {display_mode_switches}")
             pg.quit()
             logging.info("Game shut down successfully")
         except:
             pass
         exit(0)
 
+# HEADLESS SIMULATION
+
+def idle_bot():
+    """Bot that never moves, a baseline for benchmarks"""
+    return (False, False, False)
+
+def random_bot():
+    """Bot that presses random directions"""
+    direction = bot_rng.random()
+    return (direction < 0.3, direction > 0.7, False)
+
+def dodge_bot():
+    """Heuristic bot that steps away from where the closest incoming bottle will land"""
+    player_center_x = player_x + player_width // 2
+    threat = None
+    threat_landing_x = threat_clearance = 0
+    for bottle in bottles:
+        # Only bottles that can still hit the player matter
+        if bottle.hit_player or bottle.z > 1.8:
+            continue
+        if bottle.bottle_type == "air" and is_on_ground:
+            continue
+        if bottle.bottle_type == "ground" and not is_on_ground:
+            continue
+        
+        # Extrapolate the bottle's current velocity to the middle of the collision zone
+        steps_to_zone = max(0.0, (1.6 - bottle.z) / (bottle.z_speed * 3))
+        landing_x = bottle.x + (bottle.x - bottle.prev_x) * steps_to_zone
+        
+        # Hitboxes grow with depth, allow for their half-width at the far end of the collision zone
+        clearance = player_width // 2 + bottle.base_width * 3.5 + 10
+        if abs(landing_x - player_center_x) < clearance and (threat is None or bottle.z > threat.z):
+            threat = bottle
+            threat_landing_x = landing_x
+            threat_clearance = clearance
+    
+    if threat is None:
+        return (False, False, False)
+    
+    # Head for the nearer side of the landing spot that fits on screen
+    escape_left = threat_landing_x - threat_clearance
+    escape_right = threat_landing_x + threat_clearance
+    can_escape_left = escape_left >= player_width // 2
+    can_escape_right = escape_right <= SCREEN_WIDTH - player_width // 2
+    move_left = can_escape_left and (not can_escape_right or
+                                     player_center_x - escape_left <= escape_right - player_center_x)
+    return (move_left, not move_left, False)
+
+HEADLESS_BOTS = {'idle': idle_bot, 'random': random_bot, 'dodge': dodge_bot}
+
+def simulate_session(next_controls, steps, render=True, recorder=None):
+    """Run fixed simulation steps as fast as possible, taking input from next_controls, and return the results"""
+    bottles_processed = 0
+    scores = []
+    begin = time.perf_counter()
+    
+    for _ in range(steps):
+        profiler.next_frame()
+        bottles_processed += len(bottles)
+        controls = next_controls()
+        if recorder:
+            recorder.record(controls)
+        
+        # Start a new game on game over so every run covers the same number of steps
+        if simulate_game_tick(controls) is not None:
+            scores.append(final_score)
+            reset_game()
+            continue
+        
+        if render:
+            draw_game_frame(1.0)
+            pg.display.flip()
+            profiler.lap('flip')
+        pg.event.pump()
+    
+    elapsed = max(time.perf_counter() - begin, 1e-9)
+    
+    # Score the game still in progress too
+    calculate_final_score()
+    scores.append(final_score)
+    
+    return {
+        'steps': steps,
+        'seconds': round(elapsed, 3),
+        'frames_per_second': round(steps / elapsed, 1),
+        'bottles_per_second': round(bottles_processed / elapsed, 1),
+        'speedup': round(steps * SIM_STEP_MS / 1000 / elapsed, 1),
+        'final_score': scores[-1],
+        'games': len(scores),
+        'scores': scores,
+        'pools': get_pool_stats()
+    }
+
+def prepare_headless_run():
+    """Wait for images so every run draws the same sprites"""
+    while image_manager.is_loading():
+        time.sleep(0.01)
+
+def run_headless(bot=None, steps=HEADLESS_STEPS, render=True, seed=None, record_file=None):
+    """Run the game simulation as fast as possible with a bot driving the player and return the results"""
+    if bot is None:
+        bot = HEADLESS_BOTS[HEADLESS_BOT]
+    
+    prepare_headless_run()
+    seed = seed_game(seed)
+    bot_rng.seed(seed)
+    reset_game()
+    recorder = start_replay_recording(seed) if record_file else None
+    
+    results = simulate_session(bot, steps, render, recorder)
+    results['seed'] = seed
+    if recorder:
+        recorder.save(record_file)
+    
+    logging.info(f"Headless run: {results}")
+    return results
+
+def play_replay(filename, render=False):
+    """Re-run a recorded game exactly, as fast as possible, and return the results"""
+    replay = ReplayRecorder.load(filename)
+    
+    prepare_headless_run()
+    if (replay.width, replay.height) != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        update_screen_dimensions(replay.width, replay.height)
+    if bool(replay.flags & ReplayRecorder.FLAG_VECTORIZED) != bool(bottle_engine):
+        logging.warning("Replay was recorded with a different bottle engine, it may not match exactly")
+    if replay.config_checksum != bottle_config.get_checksum():
+        logging.warning("Replay was recorded with a different bottle configuration, it will not match")
+    
+    seed_game(replay.seed)
+    reset_game()
+    
+    controls = replay.iter_controls()
+    results = simulate_session(lambda: next(controls), replay.tick_count, render)
+    results['seed'] = replay.seed
+    
+    logging.info(f"Replay {filename}: {results}")
+    return results
+
 # CONSTANTS AND GLOBAL VARIABLES
 
 # Colors
@@ -3450,15 +5102,30 @@ LEADERBOARD = 6
 GAME_OVER = 7
 BOTTLE_EDIT = 8
 
+# Event types the game reacts to, TEXTINPUT is needed because pygame fills KEYDOWN.unicode from it
+HANDLED_EVENT_TYPES = [
+    pg.QUIT, pg.KEYDOWN, pg.TEXTINPUT,
+    pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEMOTION, pg.MOUSEWHEEL,
+    pg.VIDEORESIZE, pg.WINDOWMAXIMIZED, pg.WINDOWRESTORED, pg.WINDOWMINIMIZED,
+    pg.WINDOWFOCUSGAINED, pg.WINDOWFOCUSLOST, pg.WINDOWEXPOSED,
+]
+
 # Initialize pygame and check for errors
 if not safe_init():
     exit(1)
 
+# Update all bottles with batched NumPy operations instead of per-object Bottle.update
+USE_VECTORIZED_BOTTLES = False
+
 # Screen settings
 BASE_WIDTH = 800
 BASE_HEIGHT = 600
 is_fullscreen = False
 
+# Window state, kept up to date from window events instead of polling the display
+window_minimized = False
+display_mode_switches = 0  # Display surface recreations, each one can cause a frame hitch
+
 # Try to create display
 try:
     screen = create_display(BASE_WIDTH, BASE_HEIGHT, "Bottle Ops - Enhanced Edition")
@@ -3471,6 +5138,12 @@ except Exception as e:
 # Initialize clock
 clock = pg.time.Clock()
 
+# Fixed-timestep simulation, gameplay speed no longer depends on the render rate
+SIM_HZ = 60  # Simulation steps per second, movement constants are tuned for 60
+SIM_STEP_MS = 1000 / SIM_HZ
+MAX_SIM_STEPS_PER_FRAME = 5  # Slow the game down instead of spiralling after long frames
+RENDER_FPS = 60  # 30, 60 or 144, gameplay is the same at any rate
+
 # Load fonts safely
 try:
     font_large = load_font('Arial', max(24, int(36 * min(SCREEN_WIDTH/BASE_WIDTH, SCREEN_HEIGHT/BASE_HEIGHT))))
@@ -3483,9 +5156,21 @@ except Exception as e:
 # Initialize image manager
 image_manager = ImageManager()
 
+# Rendered text reused between frames
+text_cache = TextRenderCache()
+
 # Initialize bottle configuration
 bottle_config = BottleTypeConfig()
 
+# Vectorized bottle engine (optional, needs NumPy)
+bottle_engine = None
+if USE_VECTORIZED_BOTTLES:
+    if np is not None:
+        bottle_engine = BottleEngine()
+        logging.info("Using vectorized bottle engine")
+    else:
+        logging.warning("NumPy is not installed, using the standard bottle update")
+
 # Game state
 current_state = LOADING
 current_username = "NEW USER"
@@ -3547,10 +5232,25 @@ bottles_dodged = 0
 close_calls = 0
 final_score = 0
 survival_time_seconds_final = 0
-start_time = pg.time.get_ticks()
-bottles = []
+start_time = 0.0
+sim_time = start_time
+game_rng = random.Random()  # All gameplay randomness, seeded per game so games can be replayed
+bot_rng = random.Random()  # Headless bot input, seeded with the run but kept apart from game_rng so bots never shift spawns
+prev_player_x = player_x
+prev_player_y = player_y
+bottles = bottle_engine.bottles if bottle_engine else []
 visual_effects = []
 score_popups = []
+bottle_fallback_surfaces = {}  # (width, height, color) -> Surface shared by bottles without an image manager
+
+# Per-stage frame timings, collected only while the F3 overlay is on
+profiler = FrameProfiler()
+
+# Object pools, finished bottles, popups and effects are reused instead of garbage collected
+bottle_pool = ObjectPool(Bottle)
+engine_bottle_pool = ObjectPool(EngineBottle)
+popup_pool = ObjectPool(ScorePopup)
+effect_pool = ObjectPool(VisualEffect)
 
 # Bottle spawning variables
 last_bottle_time = pg.time.get_ticks()
@@ -3586,6 +5286,21 @@ scrollbar = None
 bottle_config_scroll = 0
 bottle_config_scrollbar = None
 
+# Retained widgets for each screen, built on first use and laid out again only on resize
+widget_trees = {
+    MENU: WidgetTree(build_menu_widgets, layout_menu_widgets),
+    USERNAME_INPUT: WidgetTree(build_username_widgets, layout_username_widgets),
+    PLAYING: WidgetTree(build_game_widgets, layout_game_widgets),
+    SETTINGS: WidgetTree(build_settings_widgets, layout_settings_widgets),
+    BOTTLE_CONFIG: WidgetTree(build_bottle_config_widgets, layout_bottle_config_widgets),
+    LEADERBOARD: WidgetTree(build_leaderboard_widgets, layout_leaderboard_widgets),
+    GAME_OVER: WidgetTree(build_game_over_widgets, layout_game_over_widgets),
+    BOTTLE_EDIT: WidgetTree(build_bottle_edit_widgets, layout_bottle_edit_widgets),
+}
+
+# Static screen layer for DIRTY_RECT_RENDERING
+dirty_renderer = DirtyRectRenderer()
+
 # Hand preview system
 left_hand_preview = None
 right_hand_preview = None
@@ -3604,6 +5319,32 @@ get_scaled_values()
 
 # Main execution
 if __name__ == "__main__":
+    if HEADLESS_MODE:
+        import argparse
+        parser = argparse.ArgumentParser(description="Run Bottle Ops headless with a bot")
+        parser.add_argument('--headless', action='store_true')
+        parser.add_argument('--steps', type=int, default=HEADLESS_STEPS, help="simulation steps to run")
+        parser.add_argument('--bot', choices=sorted(HEADLESS_BOTS), default=HEADLESS_BOT)
+        parser.add_argument('--no-render', action='store_true', help="skip drawing, simulation only")
+        parser.add_argument('--seed', type=int, help="game RNG seed (random by default)")
+        parser.add_argument('--record', metavar='FILE', help="save the bot's input as a replay")
+        parser.add_argument('--replay', metavar='FILE', help="re-run a recorded replay instead of a bot")
+        parser.add_argument('--profile', metavar='NAME', help="save per-frame stage timings to NAME.csv and NAME.json")
+        args = parser.parse_args()
+        
+        if args.profile:
+            profiler.toggle()
+        if args.replay:
+            results = play_replay(args.replay, not args.no_render)
+        else:
+            results = run_headless(HEADLESS_BOTS[args.bot], args.steps, not args.no_render, args.seed, args.record)
+        if args.profile:
+            profiler.next_frame()
+            profiler.dump(args.profile)
+        print(json.dumps(results, indent=2))
+        pg.quit()
+        exit(0)
+    
     try:
         logging.info("Starting Enhanced Bottle Ops game with animations")
         main() 
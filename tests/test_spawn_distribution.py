@@ -0,0 +1,52 @@
+"""Spawned bottle types must follow the configured spawn weights"""
+import os, sys, tempfile
+from collections import Counter
+
+# Run without a window. The game writes its log, cache and save files to the working directory,
+# some from background threads, so the whole test session runs in a temporary one
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix='bottle_ops_test_'))
+
+import main
+
+# Let the image loader finish here, pytest restores the original working directory when the session ends
+main.prepare_headless_run()
+
+SAMPLES = 200_000
+SEED = 1
+TOLERANCE = 0.005  # Absolute frequency error, about five standard deviations at 200k samples
+
+
+def max_deviation(config):
+    """Largest gap between a type's drawn frequency and weight / total, uniform when every weight is zero"""
+    main.seed_game(SEED)
+    counts = Counter(config.get_random_bottle_types(SAMPLES))
+    weights = {bottle_id: max(0, weight) for bottle_id, weight in config.spawn_weights.items()}
+    total = sum(weights.values())
+    assert set(counts) <= set(weights), "drew bottle types that are not configured"
+
+    if total <= 0:
+        expected = {bottle_id: 1 / len(weights) for bottle_id in weights}
+    else:
+        expected = {bottle_id: weight / total for bottle_id, weight in weights.items()}
+    return max(abs(counts[bottle_id] / SAMPLES - frequency) for bottle_id, frequency in expected.items())
+
+
+def test_default_weights():
+    assert max_deviation(main.BottleTypeConfig()) <= TOLERANCE
+
+
+def test_all_zero_weights_spawn_uniformly():
+    config = main.BottleTypeConfig()
+    config.spawn_weights = dict.fromkeys(config.spawn_weights, 0)
+    config.rebuild_spawn_table()
+    assert max_deviation(config) <= TOLERANCE
+
+
+def test_weight_edited_through_save_config():
+    config = main.BottleTypeConfig()
+    config.spawn_weights[12] = 60
+    config.save_config()
+    assert max_deviation(config) <= TOLERANCE